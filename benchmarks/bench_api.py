@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: read-only JSON API under many concurrent keep-alive readers.
+
+Publishes results for a synthetic pool into an ApiServer running in a
+background thread, then opens N asyncio clients that each send M requests
+over one connection, cycling through the routes and revalidating with
+If-None-Match every other request (so half the answers are 304s).
+
+    python benchmarks/bench_api.py [clients] [requests per client] [players]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from scrape_brasileirao_simple import ApiServer, BrasileiroScraper, PredictionIndex
+from synthetic import make_predictions, make_standings
+
+ROUTES = ["/standings", "/scores", "/teams/flamengo", "/players/Jogador%20000001", "/history", "/"]
+
+
+async def client(port, requests, latencies, statuses):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    etags = {}
+    for i in range(requests):
+        path = ROUTES[i % len(ROUTES)]
+        conditional = f"If-None-Match: {etags[path]}\r\n" if path in etags and i % 2 else ""
+        start = time.perf_counter()
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: bench\r\n{conditional}\r\n".encode('latin-1'))
+        head = await reader.readuntil(b"\r\n\r\n")
+        headers = dict(line.split(": ", 1) for line in head.decode('latin-1').split("\r\n")[1:] if ": " in line)
+        if 'Content-Length' in headers:
+            await reader.readexactly(int(headers['Content-Length']))
+        latencies.append((time.perf_counter() - start) * 1000)
+        status = int(head.split(b" ", 2)[1])
+        statuses[status] = statuses.get(status, 0) + 1
+        if 'ETag' in headers:
+            etags[path] = headers['ETag']
+    writer.close()
+
+
+async def run_clients(port, clients, requests):
+    latencies, statuses = [], {}
+    start = time.perf_counter()
+    await asyncio.gather(*(client(port, requests, latencies, statuses) for _ in range(clients)))
+    return time.perf_counter() - start, latencies, statuses
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    players = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+
+    workdir = tempfile.mkdtemp(prefix="bolao_api_")
+    scraper = BrasileiroScraper(sources=[], cache_dir=None, output_dir=workdir)
+    predictions = PredictionIndex(make_predictions(players), scraper.normalize_team_name)
+
+    api = ApiServer(port=0)
+    ready = threading.Event()
+    thread = threading.Thread(target=lambda: asyncio.run(api.serve(lambda port: ready.set())), daemon=True)
+    thread.start()
+    ready.wait()
+    api.publish(scraper, scraper.build_results(make_standings(), predictions))
+
+    elapsed, latencies, statuses = asyncio.run(run_clients(api.port, clients, requests))
+    api.stop()
+    thread.join()
+
+    # Time spent in the server per request once a route's body is cached
+    number = 20000
+    start = time.perf_counter()
+    for i in range(number):
+        api.respond("GET", ROUTES[i % len(ROUTES)], {})
+    respond_us = (time.perf_counter() - start) / number * 1e6
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{clients} clients x {requests} requests, {players} players: {total / elapsed:,.0f} req/s")
+    print(f"latency ms: p50 {statistics.median(latencies):.3f}  p99 {latencies[int(total * 0.99) - 1]:.3f}  "
+          f"max {latencies[-1]:.3f}")
+    print(f"server respond() on warm routes: {respond_us:.1f} us/request")
+    print("statuses: " + ", ".join(f"{status}={count}" for status, count in sorted(statuses.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start cost of the no-change path of run_comparison.
+
+Serves the saved ESPN fixture from a local HTTP server, primes a temporary
+pool directory with one full run (so the table fingerprint is stored) and
+then times fresh interpreters running the no-change path under
+`python -X importtime`. The "eager" row pre-imports matplotlib.pyplot the
+way the module used to at import time, for comparison.
+"""
+
+import http.server
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE = os.path.join(REPO_DIR, "benchmarks", "fixtures", "espn_bra1.html")
+
+RUN_SCRIPT = """
+import sys
+sys.path.insert(0, {repo!r})
+{preamble}
+import scrape_brasileirao_simple as m
+scraper = m.BrasileiroScraper(sources=[{{'name': 'fixture', 'layout': 'espn', 'url': {url!r}}}], cache_dir=None)
+sys.argv = ['scrape_brasileirao_simple.py']
+scraper.run_comparison('bolao.json')
+print('MATPLOTLIB_LOADED=' + str('matplotlib' in sys.modules))
+"""
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        with open(FIXTURE, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def parse_importtime(stderr):
+    """Cumulative import time (us) per top-level module from -X importtime output"""
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        cumulative = cumulative.strip()
+        # Nested imports are indented by two extra spaces per level
+        if not cumulative.isdigit() or name.startswith("   "):
+            continue
+        totals[name.strip()] = int(cumulative)
+    return totals
+
+
+def run_once(workdir, url, preamble):
+    script = RUN_SCRIPT.format(repo=REPO_DIR, url=url, preamble=preamble)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                            cwd=workdir, capture_output=True, text=True)
+    elapsed = (time.perf_counter() - start) * 1000
+    loaded = "MATPLOTLIB_LOADED=True" in result.stdout
+    return elapsed, parse_importtime(result.stderr), loaded
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/standings"
+
+    workdir = tempfile.mkdtemp(prefix="bolao_startup_")
+    try:
+        shutil.copy(os.path.join(REPO_DIR, "bolao.json"), workdir)
+        with open(os.path.join(workdir, "README.md"), 'w', encoding='utf-8') as f:
+            f.write("# Bolão\n")
+
+        # Prime: first run scores everything and stores the fingerprint
+        run_once(workdir, url, "")
+
+        scenarios = [("lazy (now)", "")]
+        try:
+            import matplotlib  # noqa: F401
+            scenarios.append(("eager (old)", "import matplotlib.pyplot"))
+        except ImportError:
+            print("ℹ️ matplotlib not installed: only the lazy scenario is measured")
+
+        print(f"{'Scenario':<12} {'wall ms':>9} {'import ms':>10} {'matplotlib':>11}")
+        print("-" * 46)
+        for name, preamble in scenarios:
+            walls, imports, loaded = [], [], False
+            for _ in range(repeats):
+                elapsed, totals, loaded = run_once(workdir, url, preamble)
+                walls.append(elapsed)
+                imports.append(sum(totals.values()) / 1000)
+            print(f"{name:<12} {statistics.median(walls):>9.1f} {statistics.median(imports):>10.1f} "
+                  f"{'loaded' if loaded else 'not loaded':>11}")
+
+        # Heaviest top-level imports of the lazy run
+        _, totals, _ = run_once(workdir, url, "")
+        print("\nTop imports (lazy, cumulative ms):")
+        for module, micros in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:10]:
+            print(f"  {module:<40} {micros / 1000:>8.1f}")
+    finally:
+        server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
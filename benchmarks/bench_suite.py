@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: timed scenarios for every stage of a run, offline.
+
+Parsing runs on the recorded fixtures in benchmarks/fixtures; pools and score
+histories come from benchmarks/synthetic.py. Each scenario is set up fresh
+in a temporary directory and only the call itself is timed (median of
+--repeat). Results are compared with benchmarks/baseline.json: a scenario
+slower than the baseline by more than --threshold, and by more than the
+spread of its own runs, is measured again with more runs and flagged only
+if it is still slow; the exit status is 1 when something regressed. Scenarios that draw a chart
+when matplotlib is installed are only compared with a baseline recorded
+with (or without) matplotlib as well.
+
+    python benchmarks/bench_suite.py                  # full suite vs. baseline
+    python benchmarks/bench_suite.py --quick          # pools up to 1k players
+    python benchmarks/bench_suite.py --save-baseline  # record a new baseline
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from scrape_brasileirao_simple import (BrasileiroScraper, ScoreHistoryStore, SiteGenerator, SOURCE_LAYOUTS,
+                                       MATPLOTLIB_AVAILABLE, NUMPY_AVAILABLE)
+from synthetic import make_history, make_predictions, make_standings, write_json
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, "fixtures")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+
+FIXTURES = {
+    'espn': "espn_bra1.html",
+    'gazeta': "gazeta_serie_a.html",
+}
+POOL_SIZES = (10, 100, 1000, 10000, 100000)
+README_SIZES = (10, 100, 1000)  # the README table gets one column per player
+OUTCOME_GAMES = 30
+SHORT_TABLE = 18  # rows of a truncated scrape (the parser accepts 15 or more)
+SIMULATED_SEASONS = 10000
+HISTORY_LENGTHS = (100, 1000, 10000)
+HISTORY_PLAYERS = 10
+CONFIRM_REPEAT = 10  # runs of the second measurement of a suspected regression
+# Scenarios whose work includes rendering a chart when matplotlib is installed
+CHART_SCENARIOS = ("update_readme/", "score_graph_chart/")
+
+
+class Workdir:
+    """Fresh temporary directory per scenario run"""
+
+    def __init__(self, root):
+        self.root = root
+        self.count = 0
+
+    def new(self):
+        self.count += 1
+        path = os.path.join(self.root, f"run{self.count}")
+        os.makedirs(path)
+        return path
+
+
+def scraper_in(path):
+    return BrasileiroScraper(sources=[], cache_dir=None, output_dir=path)
+
+
+def parse_scenario(source):
+    with open(os.path.join(FIXTURES_DIR, FIXTURES[source]), 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    layout = SOURCE_LAYOUTS[source]
+
+    def setup(workdir):
+        scraper = scraper_in(workdir.new())
+        return lambda: scraper.parse_standings(html_content, layout)
+    return setup
+
+
+def pool_file(players, cache):
+    """Synthetic bolao.json of that size, generated once per suite run"""
+    if players not in cache:
+        path = os.path.join(cache['dir'], f"bolao_{players}.json")
+        write_json(path, make_predictions(players))
+        cache[players] = path
+    return cache[players]
+
+
+def load_scenario(players, pools):
+    def setup(workdir):
+        path = pool_file(players, pools)
+        scraper = scraper_in(workdir.new())
+        return lambda: scraper.load_predictions(path)
+    return setup
+
+
+def compare_scenario(players, pools):
+    standings = make_standings()
+
+    def setup(workdir):
+        scraper = scraper_in(workdir.new())
+        predictions = scraper.load_predictions(pool_file(players, pools))
+        return lambda: scraper.compare_predictions(standings, predictions)
+    return setup
+
+
+def readme_scenario(players, pools):
+    standings = make_standings()
+
+    def setup(workdir):
+        path = workdir.new()
+        shutil.copy(os.path.join(os.path.dirname(BENCH_DIR), "README.md"), path)
+        scraper = scraper_in(path)
+        predictions = scraper.load_predictions(pool_file(players, pools))
+        results = scraper.build_results(standings, predictions)
+        results.outcomes  # timed on its own in outcomes_scenario
+        return lambda: scraper.update_readme(results)
+    return setup
+
+
+def site_scenario(players, pools):
+    """Drill-down site already generated; one team's points change (its page and the index are rewritten)"""
+    standings = make_standings()
+    changed = [dict(team_data) for team_data in standings]
+    changed[5]['points'] = str(int(changed[5]['points']) + 1)
+
+    def setup(workdir):
+        scraper = scraper_in(workdir.new())
+        site = SiteGenerator(scraper.output_path("site"))
+        predictions = scraper.load_predictions(pool_file(players, pools))
+        site.publish(scraper, scraper.build_results(standings, predictions))
+        results = scraper.build_results(changed, predictions)
+        return lambda: site.publish(scraper, results)
+    return setup
+
+
+def outcomes_scenario(players, pools, teams=None):
+    # Mid-season: most teams can still move, so the assignments are not trivial.
+    # With `teams`, the scraped table is cut short while predictions still go to 20th
+    standings = make_standings(games=OUTCOME_GAMES)[:teams]
+
+    def setup(workdir):
+        scraper = scraper_in(workdir.new())
+        predictions = scraper.load_predictions(pool_file(players, pools))
+        results = scraper.build_results(standings, predictions)
+        return lambda: results.outcomes
+    return setup
+
+
+def simulate_scenario(players, pools):
+    standings = make_standings(games=OUTCOME_GAMES)
+
+    def setup(workdir):
+        scraper = scraper_in(workdir.new())
+        predictions = scraper.load_predictions(pool_file(players, pools))
+        return lambda: scraper.simulate_season(standings, predictions, SIMULATED_SEASONS, workers=1, seed=0)
+    return setup
+
+
+def history_dir(workdir, length):
+    """Directory holding a legacy score_history.json of `length` entries"""
+    path = workdir.new()
+    write_json(os.path.join(path, "score_history.json"), make_history(length, HISTORY_PLAYERS))
+    return path
+
+
+def history_migrate_scenario(length):
+    def setup(workdir):
+        path = history_dir(workdir, length)
+        store = ScoreHistoryStore(os.path.join(path, "score_history.jsonl"),
+                                  os.path.join(path, "score_history.json"))
+        return store.last_entry
+    return setup
+
+
+def history_save_scenario(length):
+    new_scores = make_history(1, HISTORY_PLAYERS, seed=1)[0]
+
+    def setup(workdir):
+        scraper = scraper_in(history_dir(workdir, length))
+        scraper.history_store.last_entry()  # migration is not what is timed here
+        return lambda: scraper.save_score_history(new_scores['normalized_scores'],
+                                                  new_scores['raw_scores'], 38)
+    return setup
+
+
+def history_filter_scenario(length):
+    history = make_history(length, HISTORY_PLAYERS)
+
+    def setup(workdir):
+        scraper = scraper_in(workdir.new())
+        return lambda: scraper.filter_unique_rounds(history)
+    return setup
+
+
+def history_rounds_scenario(length):
+    def setup(workdir):
+        scraper = scraper_in(history_dir(workdir, length))
+        scraper.history_store.last_entry()
+        return scraper.history_store.latest_per_round
+    return setup
+
+
+def graph_scenario(length, render):
+    def setup(workdir):
+        scraper = scraper_in(history_dir(workdir, length))
+        scraper.history_store.last_entry()
+        if not render:
+            # An existing image is reused as is: without one, the chart would be drawn anyway
+            with open(scraper.chart_path, 'wb'):
+                pass
+        return lambda: scraper.generate_score_graph(render_chart=render)
+    return setup
+
+
+def build_scenarios(pool_sizes, pools):
+    scenarios = [(f"parse/{source}", parse_scenario(source)) for source in FIXTURES]
+    for players in pool_sizes:
+        scenarios.append((f"load_predictions/{players}", load_scenario(players, pools)))
+        scenarios.append((f"compare/{players}", compare_scenario(players, pools)))
+    for players in README_SIZES:
+        if players in pool_sizes:
+            scenarios.append((f"update_readme/{players}", readme_scenario(players, pools)))
+            scenarios.append((f"outcomes/{players}", outcomes_scenario(players, pools)))
+            scenarios.append((f"outcomes_short/{players}", outcomes_scenario(players, pools, SHORT_TABLE)))
+            scenarios.append((f"site_update/{players}", site_scenario(players, pools)))
+            if NUMPY_AVAILABLE:
+                scenarios.append((f"simulate/{players}", simulate_scenario(players, pools)))
+    for length in HISTORY_LENGTHS:
+        scenarios.append((f"history_migrate/{length}", history_migrate_scenario(length)))
+        scenarios.append((f"save_score_history/{length}", history_save_scenario(length)))
+        scenarios.append((f"filter_unique_rounds/{length}", history_filter_scenario(length)))
+        scenarios.append((f"latest_per_round/{length}", history_rounds_scenario(length)))
+        scenarios.append((f"score_graph_text/{length}", graph_scenario(length, False)))
+        if MATPLOTLIB_AVAILABLE:
+            scenarios.append((f"score_graph_chart/{length}", graph_scenario(length, True)))
+    return scenarios
+
+
+def measure(setup, workdir, repeat):
+    """(median, spread) wall time in ms of `repeat` freshly set up runs (output discarded)
+
+    The spread (slowest - fastest run) is this run's own noise floor.
+    """
+    times = []
+    with open(os.devnull, 'w', encoding='utf-8') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(repeat):
+            run = setup(workdir)
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), max(times) - min(times)
+
+
+def slower(ms, spread, base, args):
+    """Slower than the baseline by more than the threshold, the timer noise and the run's spread"""
+    return ms - base > max(args.threshold * base, args.min_delta_ms, spread)
+
+
+def load_baseline():
+    """(scenario timings, whether matplotlib was installed when they were recorded)"""
+    if not os.path.exists(BASELINE_FILE):
+        return {}, MATPLOTLIB_AVAILABLE
+    with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    return baseline.get('scenarios', {}), baseline.get('matplotlib', MATPLOTLIB_AVAILABLE)
+
+
+def save_baseline(results):
+    baseline = {
+        'recorded': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'matplotlib': MATPLOTLIB_AVAILABLE,
+        'scenarios': {name: round(ms, 3) for name, ms in results.items()},
+    }
+    with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite with baseline comparison")
+    parser.add_argument('--quick', action='store_true', help="pools up to 1000 players only")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per scenario (the median is kept)")
+    parser.add_argument('--filter', default='', help="only scenarios whose name contains this text")
+    parser.add_argument('--threshold', type=float, default=0.30,
+                        help="relative slowdown vs. baseline flagged as a regression (0.30 = 30%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help="ignore slowdowns smaller than this many ms (timer noise)")
+    parser.add_argument('--save-baseline', action='store_true', help=f"write results to {BASELINE_FILE}")
+    args = parser.parse_args()
+
+    pool_sizes = [size for size in POOL_SIZES if not args.quick or size <= 1000]
+    baseline, baseline_matplotlib = load_baseline()
+    if baseline_matplotlib != MATPLOTLIB_AVAILABLE:
+        # Those timings include (or lack) chart rendering: not comparable
+        print(f"ℹ️ Baseline recorded {'with' if baseline_matplotlib else 'without'} matplotlib: "
+              f"{', '.join(prefix + '*' for prefix in CHART_SCENARIOS)} not compared\n")
+        baseline = {name: ms for name, ms in baseline.items() if not name.startswith(CHART_SCENARIOS)}
+    results = {}
+    regressions = []
+
+    root = tempfile.mkdtemp(prefix="bolao_bench_")
+    try:
+        workdir = Workdir(root)
+        pools = {'dir': root}
+        print(f"{'Scenario':<30} {'ms':>10} {'baseline':>10} {'change':>8}")
+        print("-" * 62)
+        for name, setup in build_scenarios(pool_sizes, pools):
+            if args.filter not in name:
+                continue
+            ms, spread = measure(setup, workdir, args.repeat)
+            base = baseline.get(name)
+            flag = ""
+            if base is not None and not args.save_baseline and slower(ms, spread, base, args):
+                # Measure again, longer, before calling it a regression: one busy moment is not one
+                ms, spread = measure(setup, workdir, max(CONFIRM_REPEAT, 2 * args.repeat))
+                if slower(ms, spread, base, args):
+                    regressions.append(name)
+                    flag = "  ⚠️ regression"
+            results[name] = ms
+            line = f"{name:<30} {ms:>10.2f}"
+            if base is not None:
+                change = (ms - base) / base if base else 0.0
+                line += f" {base:>10.2f} {change:>+7.0%}{flag}"
+            print(line)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    if args.save_baseline:
+        if args.filter or args.quick:
+            # Keep the scenarios that were not run this time
+            baseline.update(results)
+            results = baseline
+        save_baseline(results)
+        print(f"\n💾 Baseline saved to {BASELINE_FILE}")
+    elif regressions:
+        print(f"\n⚠️ {len(regressions)} scenario(s) slower than baseline by more than {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        sys.exit(1)
+    elif baseline:
+        print(f"\n✅ No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
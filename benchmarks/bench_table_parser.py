@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark: single-pass TableExtractor vs. the old regex row scans.
+Runs offline against the saved HTML fixtures in benchmarks/fixtures.
+"""
+
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrape_brasileirao_simple import BrasileiroScraper, SOURCE_LAYOUTS, TEAM_REGISTRY
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+GAZETA_KNOWN_TEAMS = [
+    'Flamengo', 'Palmeiras', 'Cruzeiro', 'Corinthians', 'São Paulo',
+    'Santos', 'Grêmio', 'Internacional', 'Atlético', 'Fluminense',
+    'Botafogo', 'Vasco', 'Bahia', 'Fortaleza', 'Ceará', 'Sport',
+    'Vitória', 'Bragantino', 'Juventude', 'Mirassol', 'Cuiabá'
+]
+
+FIXTURES = {
+    'espn': "espn_bra1.html",
+    'gazeta': "gazeta_serie_a.html",
+}
+
+
+def display_name(team_name):
+    """Names go through the shared registry on both paths; only the scanning is compared"""
+    return TEAM_REGISTRY.display(TEAM_REGISTRY.canonical(team_name))
+
+
+def regex_parse_espn(html_content):
+    """Old scrape_espn_standings parsing, kept as the reference implementation"""
+    teams = []
+    rows = re.findall(r'<tr[^>]*>.*?</tr>', html_content, re.DOTALL | re.IGNORECASE)
+    position = 1
+    for row in rows:
+        if 'th>' in row or 'header' in row.lower():
+            continue
+        team_match = re.search(r'<a[^>]*>([^<]*(?:Flamengo|Palmeiras|São Paulo|Corinthians|Grêmio|Internacional|Atlético|Santos|Fluminense|Botafogo|Vasco|Bahia|Cruzeiro|Fortaleza|Ceará|Sport|Vitória|Athletico|Bragantino|Juventude|Mirassol|Cuiabá|Goiás|Coritiba|América)[^<]*)</a>', row, re.IGNORECASE)
+        if team_match:
+            team_name = re.sub(r'\s+', ' ', team_match.group(1).strip())
+            cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.DOTALL | re.IGNORECASE)
+            if len(cells) >= 5:
+                clean_cells = [re.sub(r'<[^>]+>', '', cell).strip() for cell in cells]
+                games_played = '0'
+                for cell in clean_cells[1:4]:
+                    if cell.isdigit() and 0 <= int(cell) <= 38:
+                        games_played = cell
+                        break
+                teams.append({
+                    'position': position,
+                    'team': display_name(team_name),
+                    'points': clean_cells[-1] if clean_cells else '0',
+                    'games': games_played
+                })
+                position += 1
+                if position > 20:
+                    break
+    return teams if teams else None
+
+
+def regex_parse_gazeta(html_content):
+    """Old scrape_gazeta_standings parsing, kept as the reference implementation"""
+    teams = []
+    known_teams = GAZETA_KNOWN_TEAMS
+    table_match = re.search(r'<table[^>]*>.*?</table>', html_content, re.DOTALL)
+    if table_match:
+        rows = re.findall(r'<tr[^>]*>.*?</tr>', table_match.group(0), re.DOTALL)
+        position = 1
+        for i, row in enumerate(rows):
+            if '<th>' in row or i == 0:
+                continue
+            cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.DOTALL)
+            if len(cells) >= 3:
+                clean_cells = []
+                for cell in cells:
+                    clean_text = re.sub(r'<[^>]+>', '', cell).strip()
+                    clean_cells.append(re.sub(r'\s+', ' ', clean_text))
+                team_name = None
+                for cell in clean_cells:
+                    if any(team in cell for team in known_teams):
+                        team_name = cell
+                        break
+                points = '0'
+                games_played = '0'
+                for cell in reversed(clean_cells):
+                    if cell.isdigit() and int(cell) <= 114:
+                        points = cell
+                        break
+                for cell in clean_cells:
+                    if cell.isdigit() and 0 <= int(cell) <= 38:
+                        games_played = cell
+                        break
+                if team_name:
+                    teams.append({'position': position, 'team': display_name(team_name), 'points': points, 'games': games_played})
+                    position += 1
+                    if position > 20:
+                        break
+    return teams if teams else None
+
+
+REGEX_PARSERS = {
+    'espn': regex_parse_espn,
+    'gazeta': regex_parse_gazeta,
+}
+
+
+def main():
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    scraper = BrasileiroScraper()
+
+    print(f"{'Source':<10} {'KB':>6} {'regex ms':>10} {'parser ms':>10} {'speedup':>8}  same")
+    print("-" * 56)
+    for source, filename in FIXTURES.items():
+        with open(os.path.join(FIXTURES_DIR, filename), 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        layout = SOURCE_LAYOUTS[source]
+
+        regex_result = REGEX_PARSERS[source](html_content)
+        parser_result = scraper.parse_standings(html_content, layout)
+
+        regex_ms = min(timeit.repeat(lambda: REGEX_PARSERS[source](html_content), number=number, repeat=3)) / number * 1000
+        parser_ms = min(timeit.repeat(lambda: scraper.parse_standings(html_content, layout), number=number, repeat=3)) / number * 1000
+
+        print(f"{source:<10} {len(html_content) / 1024:>6.0f} {regex_ms:>10.2f} {parser_ms:>10.2f} "
+              f"{regex_ms / parser_ms:>7.1f}x  {'✅' if regex_result == parser_result else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
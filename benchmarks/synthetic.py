@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Synthetic inputs for the benchmarks: standings, prediction pools and score
+histories of any size. Everything is seeded, so the same arguments always
+produce the same files.
+
+    python benchmarks/synthetic.py bolao 100000 /tmp/bolao_100k.json
+    python benchmarks/synthetic.py history 5000 /tmp/score_history.json
+"""
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+
+# Spelled the way bolao.json spells them
+TEAMS = [
+    'Flamengo', 'Palmeiras', 'Cruzeiro', 'Mirassol', 'Fluminense',
+    'Botafogo', 'Bahia', 'São Paulo', 'Grêmio', 'Bragantino',
+    'Atlético-MG', 'Santos', 'Corinthians', 'Vasco', 'Vitória',
+    'Internacional', 'Ceará', 'Fortaleza', 'Juventude', 'Sport',
+]
+
+
+def make_standings(seed=0, games=38):
+    """A shuffled 20-team table in the shape parse_standings returns"""
+    rng = random.Random(seed)
+    teams = TEAMS[:]
+    rng.shuffle(teams)
+    points = sorted((rng.randint(20, 85) for _ in teams), reverse=True)
+    return [{'position': i, 'team': team, 'points': str(points[i - 1]), 'games': str(games)}
+            for i, team in enumerate(teams, 1)]
+
+
+def make_predictions(players, seed=0):
+    """bolao.json content with `players` random but valid 1..20 predictions"""
+    rng = random.Random(seed)
+    pool = {}
+    for player in range(players):
+        teams = TEAMS[:]
+        rng.shuffle(teams)
+        pool[f"Jogador {player:06d}"] = {str(position): team for position, team in enumerate(teams, 1)}
+    return pool
+
+
+def make_history(entries, players=10, seed=0, rounds=38):
+    """Legacy score_history.json list: `entries` updates spread over `rounds`
+    rounds, several per round, timestamps strictly increasing"""
+    rng = random.Random(seed)
+    names = [f"Jogador {player:06d}" for player in range(players)]
+    start = datetime(2025, 3, 29, 18, 0, 0)
+    history = []
+    for i in range(entries):
+        round_num = 1 + i * rounds // max(entries, 1)
+        raw_scores = {name: rng.randint(200, 400) for name in names}
+        history.append({
+            'timestamp': (start + timedelta(minutes=37 * i)).strftime('%Y-%m-%d %H:%M:%S'),
+            'round': round_num,
+            'normalized_scores': {name: round((score - 200) / 2, 1) for name, score in raw_scores.items()},
+            'raw_scores': raw_scores,
+        })
+    return history
+
+
+def write_json(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[1] not in ('bolao', 'history'):
+        print("Usage: synthetic.py bolao|history <size> <output.json>")
+        sys.exit(2)
+    kind, size, path = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+    write_json(path, make_predictions(size) if kind == 'bolao' else make_history(size))
+    print(f"✅ Wrote {kind} with {size} {'players' if kind == 'bolao' else 'entries'} to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,237 +6,2478 @@ Compares actual standings with player predictions and calculates scores.
 
 import json
 import os
-import urllib.request
+import codecs
+import csv
+import io
+import contextlib
+import hashlib
+import http.client
+import importlib
+import importlib.util
+import zlib
 import urllib.parse
 import ssl
 import re
-from datetime import datetime
+import random
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unicodedata
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime, timedelta
+import html
 import base64
 
-try:
-    import matplotlib.pyplot as plt
-    import matplotlib.dates as mdates
-    from matplotlib.backends.backend_agg import FigureCanvasAgg
-    MATPLOTLIB_AVAILABLE = True
-except ImportError:
-    MATPLOTLIB_AVAILABLE = False
+# matplotlib (and brotli) are imported on first use: runs that never draw a
+# chart must not pay for matplotlib's import and font cache at startup
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+NUMPY_AVAILABLE = importlib.util.find_spec("numpy") is not None
+matplotlib = None
+np = None
+Figure = None
+FigureCanvasAgg = None
+
+
+def load_matplotlib():
+    """Import the Agg plotting backend the first time a chart is drawn"""
+    global matplotlib, Figure, FigureCanvasAgg, MATPLOTLIB_AVAILABLE
+    if matplotlib is None and MATPLOTLIB_AVAILABLE:
+        try:
+            mpl = importlib.import_module("matplotlib")
+            importlib.import_module("matplotlib.style")
+            backend_agg = importlib.import_module("matplotlib.backends.backend_agg")
+            figure = importlib.import_module("matplotlib.figure")
+        except ImportError:
+            MATPLOTLIB_AVAILABLE = False
+            return False
+        FigureCanvasAgg = backend_agg.FigureCanvasAgg
+        Figure = figure.Figure
+        matplotlib = mpl
+    return MATPLOTLIB_AVAILABLE
+
+
+def load_numpy():
+    """Import numpy the first time a vectorized path runs"""
+    global np, NUMPY_AVAILABLE
+    if np is None and NUMPY_AVAILABLE:
+        try:
+            np = importlib.import_module("numpy")
+        except ImportError:
+            NUMPY_AVAILABLE = False
+    return NUMPY_AVAILABLE
+
+
+# Declarative description of where each source keeps its standings columns.
+# 'table' is the index of the <table> to read (None = every table on the page),
+# 'team' says whether the name comes from a link or from a plain cell (either
+# way it must name a TEAM_REGISTRY team) and number fields pick the
+# first/last cell in a slice holding a number <= max.
+SOURCE_LAYOUTS = {
+    'espn': {
+        'url': "https://www.espn.com.br/futebol/liga/_/nome/bra.1",
+        'table': None,
+        'skip_header': True,
+        'min_cells': 5,
+        'team': {'from': 'link'},
+        'games': {'pick': 'first', 'cells': (1, 4), 'max': 38},
+        'points': {'pick': 'cell', 'index': -1},
+    },
+    'gazeta': {
+        'url': "https://www.gazetaesportiva.com/campeonatos/brasileiro-serie-a/",
+        'table': 0,
+        'skip_first_row': True,
+        'min_cells': 3,
+        'team': {'from': 'cell'},
+        'games': {'pick': 'first', 'cells': (0, None), 'max': 38},
+        'points': {'pick': 'last', 'cells': (0, None), 'max': 114},
+    },
+}
+
+# Canonical team registry: (canonical id used in bolao.json, display name
+# shown in tables, other names the sources use). Matching is accent- and
+# case-insensitive, so aliases only need to list genuinely different names.
+TEAMS = [
+    ('Flamengo', 'Flamengo', []),
+    ('Palmeiras', 'Palmeiras', []),
+    ('Cruzeiro', 'Cruzeiro', []),
+    ('Mirassol', 'Mirassol', []),
+    ('Fluminense', 'Fluminense', []),
+    ('Botafogo', 'Botafogo', []),
+    ('Bahia', 'Bahia', []),
+    ('São Paulo', 'São Paulo', []),
+    ('Grêmio', 'Grêmio', []),
+    ('Bragantino', 'Red Bull Bragantino', ['RB Bragantino', 'Red Bull Bragantino']),
+    ('Atlético-MG', 'Atlético-MG', ['Atlético Mineiro', 'Atlético']),
+    ('Santos', 'Santos', []),
+    ('Corinthians', 'Corinthians', []),
+    ('Vasco', 'Vasco da Gama', ['Vasco da Gama']),
+    ('Vitória', 'Vitória', []),
+    ('Internacional', 'Internacional', []),
+    ('Ceará', 'Ceará', []),
+    ('Fortaleza', 'Fortaleza', []),
+    ('Juventude', 'Juventude', []),
+    ('Sport', 'Sport', ['Sport Recife']),
+    ('Athletico-PR', 'Athletico-PR', ['Athletico Paranaense', 'Athletico']),
+    ('Atlético-GO', 'Atlético-GO', ['Atlético Goianiense']),
+    ('Cuiabá', 'Cuiabá', []),
+    ('Goiás', 'Goiás', []),
+    ('Coritiba', 'Coritiba', []),
+    ('América-MG', 'América-MG', ['América Mineiro', 'América']),
+    ('Criciúma', 'Criciúma', []),
+]
+
+
+class TeamRegistry:
+    """Canonical team names with precompiled alias lookup shared by every source
+
+    Exact names go through an accent-folded dict; names embedded in longer
+    text ("1 Flamengo", "Red Bull Bragantino SP") go through an Aho-Corasick
+    automaton over the same aliases, longest whole-word match winning.
+    Results are memoized, so each distinct string is resolved once.
+    """
+
+    def __init__(self, teams):
+        self.display_names = {}
+        self.aliases = {}
+        for canonical, display, aliases in teams:
+            self.display_names[canonical] = display
+            for alias in [canonical, display] + aliases:
+                self.aliases[self.fold(alias)] = canonical
+        self._build_automaton()
+        self._cache = {}
+
+    @staticmethod
+    def fold(name):
+        """Lowercase, strip accents and treat hyphens as spaces"""
+        name = unicodedata.normalize('NFKD', name)
+        name = ''.join(ch for ch in name if not unicodedata.combining(ch))
+        return ' '.join(name.lower().replace('-', ' ').split())
+
+    def _build_automaton(self):
+        # Trie of folded aliases: goto transitions, failure links and outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for alias, canonical in self.aliases.items():
+            state = 0
+            for ch in alias:
+                if ch not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                    self._goto[state][ch] = len(self._goto) - 1
+                state = self._goto[state][ch]
+            self._output[state].append((len(alias), canonical))
+
+        # Breadth-first: depth-1 states fail to the root, deeper ones to the
+        # longest proper suffix that is also in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(ch, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _search(self, folded):
+        """Longest alias found as a whole word inside folded text"""
+        best = None
+        state = 0
+        for end, ch in enumerate(folded, 1):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, canonical in self._output[state]:
+                start = end - length
+                if start > 0 and folded[start - 1].isalnum():
+                    continue
+                if end < len(folded) and folded[end].isalnum():
+                    continue
+                if best is None or length > best[0]:
+                    best = (length, canonical)
+        return best[1] if best else None
+
+    def canonical(self, name):
+        """Canonical id for a team name (exact or embedded), None if unknown"""
+        if name in self._cache:
+            return self._cache[name]
+        folded = self.fold(name)
+        result = self.aliases.get(folded)
+        if result is None and folded:
+            result = self._search(folded)
+        self._cache[name] = result
+        return result
+
+    def display(self, canonical):
+        return self.display_names.get(canonical, canonical)
+
+
+TEAM_REGISTRY = TeamRegistry(TEAMS)
+
+
+def slugify(name):
+    """File-name-safe form of a player or team name ("São Paulo" -> "sao-paulo")"""
+    return re.sub(r'[^a-z0-9]+', '-', TeamRegistry.fold(name)).strip('-') or "sem-nome"
+
+# Returned by get_current_standings when the winning source's table is
+# byte-for-byte what produced the last saved standings
+STANDINGS_UNCHANGED = object()
+
+
+class TableRow:
+    """One <tr> as seen by TableExtractor"""
+    __slots__ = ('table_index', 'row_index', 'cells', 'links', 'has_th', 'header')
+
+    def __init__(self, table_index, row_index):
+        self.table_index = table_index
+        self.row_index = row_index
+        self.cells = []
+        self.links = []
+        self.has_th = False
+        # True for <th> rows and rows whose markup mentions "header"
+        self.header = False
+
+
+class TableExtractor:
+    """Single-pass, event-driven <tr>/<td> extractor
+
+    One precompiled tag scanner walks the page once; rows are handed to
+    on_row as soon as their </tr> is seen and on_row returns True to stop,
+    after which the rest of the document is never scanned.
+    """
+
+    TAG_PATTERN = re.compile(r'<!--.*?-->|<(/?)([a-zA-Z][a-zA-Z0-9]*)([^>]*)>', re.DOTALL)
+
+    def __init__(self, on_row, table=None):
+        self.on_row = on_row
+        self.table = table
+        self.done = False
+        self._table_index = -1
+        self._row_index = 0
+        self._row = None
+        self._cell = None
+        self._link = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'table':
+            self._table_index += 1
+            self._row_index = 0
+            return
+        if self.table is not None and self._table_index != self.table:
+            return
+        if tag == 'tr':
+            self._row = TableRow(self._table_index, self._row_index)
+            self._row_index += 1
+            self._cell = None
+            self._link = None
+        elif self._row is None:
+            return
+        elif tag == 'td':
+            self._cell = []
+        elif tag == 'th':
+            self._row.has_th = True
+            self._row.header = True
+        elif tag == 'a':
+            self._link = []
+        if 'header' in attrs.lower():
+            self._row.header = True
+
+    def handle_endtag(self, tag):
+        if tag == 'table':
+            if self.table is not None and self._table_index == self.table:
+                self.done = True
+            return
+        if self._row is None:
+            return
+        if tag == 'td' and self._cell is not None:
+            self._row.cells.append(self._text(self._cell))
+            self._cell = None
+        elif tag == 'a' and self._link is not None:
+            self._row.links.append(self._text(self._link))
+            self._link = None
+        elif tag == 'tr':
+            row, self._row = self._row, None
+            if self.on_row(row):
+                self.done = True
+
+    def handle_data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+        if self._link is not None:
+            self._link.append(data)
+
+    def _text(self, parts):
+        text = ' '.join(''.join(parts).split())
+        return html.unescape(text) if '&' in text else text
+
+    def extract(self, html_content):
+        """Scan the document once, stopping as soon as the consumer is satisfied"""
+        # Nothing before the first <table> can hold standings rows, so skip the
+        # <head>/scripts/navigation without tokenizing them
+        position = html_content.find('<table')
+        if position < 0:
+            return
+        for match in self.TAG_PATTERN.finditer(html_content, position):
+            if match.start() > position:
+                self.handle_data(html_content[position:match.start()])
+            position = match.end()
+            tag = match.group(2)
+            if tag is None:
+                continue  # comment
+            tag = tag.lower()
+            if match.group(1):
+                self.handle_endtag(tag)
+            else:
+                self.handle_starttag(tag, match.group(3))
+            if self.done:
+                break
+
+
+class BodyDecoder:
+    """Incremental Content-Encoding + UTF-8 decoder for streamed bodies"""
+
+    def __init__(self, content_encoding):
+        content_encoding = (content_encoding or '').lower()
+        # gzip and zlib-wrapped deflate are both auto-detected with wbits | 32
+        self.inflater = zlib.decompressobj(zlib.MAX_WBITS | 32) if content_encoding in ('gzip', 'x-gzip', 'deflate') else None
+        # brotli has no portable streaming API: buffered and decoded at the end
+        self.brotli_chunks = [] if content_encoding == 'br' else None
+        self.text = codecs.getincrementaldecoder('utf-8')()
+
+    def feed(self, chunk):
+        if self.brotli_chunks is not None:
+            self.brotli_chunks.append(chunk)
+            return ''
+        if self.inflater is not None:
+            chunk = self.inflater.decompress(chunk)
+        return self.text.decode(chunk)
+
+    def flush(self):
+        if self.brotli_chunks is not None:
+            raw = importlib.import_module("brotli").decompress(b''.join(self.brotli_chunks))
+            return self.text.decode(raw, final=True)
+        tail = self.inflater.flush() if self.inflater is not None else b''
+        return self.text.decode(tail, final=True)
+
+
+class HttpResponse:
+    """What HttpClient.request returns: status, headers and decoded text"""
+
+    def __init__(self, url, status, headers, text=None, truncated=False):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.text = text
+        # True when the read stopped early because the caller had what it needed
+        self.truncated = truncated
+
+
+class RequestCancelled(Exception):
+    """Raised by HttpClient.request once its `cancelled` event is set"""
+
+
+class HttpClient:
+    """Keep-alive HTTP(S) client: per-host connection pools, bounded retries
+    with jittered exponential backoff, per-request timeouts and streaming
+    reads that can stop as soon as the interesting part has arrived.
+
+    A request given a `cancelled` event gives up when it is set: abort()
+    shuts the sockets it is blocked on, so no read outlives the caller.
+    """
+
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+    def __init__(self, ssl_context, max_retries=2, backoff_base=0.5, backoff_max=8.0,
+                 max_redirects=5, chunk_size=16384):
+        self.ssl_context = ssl_context
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_redirects = max_redirects
+        self.chunk_size = chunk_size
+        self._idle = {}  # (scheme, host, port) -> idle connections
+        self._active = {}  # cancelled event -> connections in use by its requests
+        self._lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'connections': 0,
+            'reused': 0,
+            'handshake_ms': [],
+            'retries': 0,
+            'retry_wait_ms': 0.0,
+            'bytes': 0,
+            'early_stops': 0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _connect(self, key, timeout):
+        scheme, host, port = key
+        if scheme == 'https':
+            conn = http.client.HTTPSConnection(host, port, timeout=timeout, context=self.ssl_context)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        # Connect explicitly so TCP + TLS handshake latency can be measured
+        start = time.perf_counter()
+        conn.connect()
+        with self._lock:
+            self.stats['connections'] += 1
+            self.stats['handshake_ms'].append((time.perf_counter() - start) * 1000)
+        return conn
+
+    def _acquire(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+        if conn is None:
+            return self._connect(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        self._count('reused')
+        return conn, True
+
+    def _release(self, key, conn):
+        with self._lock:
+            self._idle.setdefault(key, []).append(conn)
+
+    def _track(self, cancelled, conn, active=True):
+        if cancelled is None:
+            return
+        with self._lock:
+            connections = self._active.setdefault(cancelled, set())
+            if active:
+                connections.add(conn)
+            else:
+                connections.discard(conn)
+                if not connections:
+                    del self._active[cancelled]
+        if active and cancelled.is_set():
+            raise RequestCancelled()
+
+    def abort(self, cancelled):
+        """Interrupt the requests started with `cancelled` (which must already be set)"""
+        with self._lock:
+            connections = list(self._active.get(cancelled, ()))
+        for conn in connections:
+            sock = conn.sock
+            if sock is not None:
+                # shutdown() wakes a thread blocked in recv(); close() alone does not
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def close(self):
+        """Close every idle pooled connection"""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for conn in connections:
+                conn.close()
+
+    def request(self, url, headers=None, timeout=15, stop_marker=None, stop_when=None, cancelled=None):
+        """GET a URL following redirects; see _read for the early-stop contract"""
+        for _ in range(self.max_redirects + 1):
+            response = self._request_with_retries(url, headers or {}, timeout, stop_marker, stop_when, cancelled)
+            location = response.headers.get('Location')
+            if response.status in self.REDIRECT_STATUSES and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return response
+        raise http.client.HTTPException(f"Too many redirects for {url}")
+
+    def _request_with_retries(self, url, headers, timeout, stop_marker, stop_when, cancelled):
+        attempt = 0
+        while True:
+            if cancelled is not None and cancelled.is_set():
+                raise RequestCancelled()
+            try:
+                response = self._request_once(url, headers, timeout, stop_marker, stop_when, cancelled)
+                if response.status not in self.RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+            except (OSError, http.client.HTTPException):
+                if attempt >= self.max_retries:
+                    raise
+            attempt += 1
+            delay = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+            with self._lock:
+                self.stats['retries'] += 1
+                self.stats['retry_wait_ms'] += delay * 1000
+            if cancelled is not None:
+                cancelled.wait(delay)  # wakes up as soon as the request is cancelled
+            else:
+                time.sleep(delay)
+
+    def _request_once(self, url, headers, timeout, stop_marker, stop_when, cancelled):
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == 'https' else 80))
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        conn, reused = self._acquire(key, timeout)
+        try:
+            try:
+                self._track(cancelled, conn)
+                try:
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                except (OSError, http.client.HTTPException):
+                    if not reused or (cancelled is not None and cancelled.is_set()):
+                        raise
+                    # The server dropped an idle keep-alive connection: redo once on a fresh one
+                    self._track(cancelled, conn, active=False)
+                    conn.close()
+                    conn = self._connect(key, timeout)
+                    self._track(cancelled, conn)
+                    conn.request('GET', path, headers=headers)
+                    response = conn.getresponse()
+                self._count('requests')
+                result = self._read(url, response, stop_marker, stop_when, cancelled)
+            finally:
+                self._track(cancelled, conn, active=False)
+        except BaseException as e:
+            conn.close()
+            if cancelled is not None and cancelled.is_set() and not isinstance(e, RequestCancelled):
+                raise RequestCancelled() from e
+            raise
+
+        if result.truncated or response.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        return result
+
+    def _read(self, url, response, stop_marker, stop_when, cancelled=None):
+        """Stream the body; when stop_marker shows up, stop_when(text_so_far) may end the read"""
+        if response.status == 304 or response.status in self.REDIRECT_STATUSES or response.status >= 400:
+            response.read()
+            return HttpResponse(url, response.status, response.headers)
+
+        decoder = BodyDecoder(response.headers.get('Content-Encoding'))
+        parts = []
+        tail = ''
+        truncated = False
+        while True:
+            chunk = response.read(self.chunk_size)
+            if cancelled is not None and cancelled.is_set():
+                raise RequestCancelled()
+            if not chunk:
+                break
+            self._count('bytes', len(chunk))
+            text = decoder.feed(chunk)
+            if not text:
+                continue
+            parts.append(text)
+            if stop_when is not None and stop_marker in tail + text:
+                if stop_when(''.join(parts)):
+                    truncated = True
+                    self._count('early_stops')
+                    break
+            tail = text[-len(stop_marker):] if stop_marker else ''
+        if not truncated:
+            parts.append(decoder.flush())
+        return HttpResponse(url, response.status, response.headers, ''.join(parts), truncated)
+
+    def summary(self):
+        with self._lock:
+            stats = dict(self.stats)
+        handshakes = stats['handshake_ms']
+        average = sum(handshakes) / len(handshakes) if handshakes else 0
+        return (f"{stats['requests']} requests, {stats['connections']} handshakes (avg {average:.0f} ms), "
+                f"{stats['reused']} reused, {stats['retries']} retries ({stats['retry_wait_ms']:.0f} ms backoff), "
+                f"{stats['bytes'] // 1024} KB, {stats['early_stops']} early stops")
+
+
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that holds back what worker threads print
+
+    Inside capture(buffer), the calling thread's writes go to buffer; every
+    other write goes straight to the wrapped stream. The owner prints the
+    buffers once the workers are done, so lines never interleave.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+
+    @property
+    def encoding(self):
+        return getattr(self.stream, 'encoding', None)
+
+    @contextlib.contextmanager
+    def capture(self, buffer):
+        self._local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            self._local.buffer = None
+
+    def write(self, text):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+class RunMetrics:
+    """Stage timers and counters of one run, appended as a JSON line to run_metrics.jsonl"""
 
-class BrasileiroScraper:
     def __init__(self):
+        self.started = datetime.now()
+        self._start = time.perf_counter()
+        self.stages = {}    # stage name -> accumulated seconds
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Time a block; repeated stages (and stages run by worker threads) accumulate"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'timestamp': self.started.strftime('%Y-%m-%d %H:%M:%S'),
+                'total_ms': round((time.perf_counter() - self._start) * 1000, 2),
+                'stages_ms': {name: round(seconds * 1000, 2) for name, seconds in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+    def summary(self):
+        metrics = self.as_dict()
+        stages = ", ".join(f"{name} {ms:.0f} ms" for name, ms in metrics['stages_ms'].items())
+        return f"{metrics['total_ms']:.0f} ms total ({stages or 'no stages'})"
+
+    def write(self, path):
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(self.as_dict(), ensure_ascii=False) + "\n")
+
+
+class HttpCache:
+    """Persistent HTTP response cache with TTL freshness, revalidation and LRU eviction"""
+
+    def __init__(self, cache_dir=".http_cache", ttl=300, max_bytes=20 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self.lock = threading.Lock()
+        self.hits = 0          # served from disk without touching the network
+        self.revalidated = 0   # 304 Not Modified
+        self.misses = 0        # full download
+        self.index = {}
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self.index = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable HTTP cache index: {e}")
+            self.index = {}
+
+    def _body_path(self, entry):
+        return os.path.join(self.cache_dir, entry['file'])
+
+    def _read_body(self, entry):
+        with open(self._body_path(entry), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    def get_fresh(self, url):
+        """Cached body if it is still within the TTL, else None"""
+        with self.lock:
+            entry = self.index.get(url)
+            if not entry or time.time() - entry['stored_at'] >= self.ttl:
+                return None
+            try:
+                body = self._read_body(entry)
+            except OSError:
+                del self.index[url]
+                return None
+            entry['last_used'] = time.time()
+            self.hits += 1
+            return body
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a stale entry"""
+        headers = {}
+        with self.lock:
+            entry = self.index.get(url)
+            if entry:
+                if entry.get('etag'):
+                    headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def not_modified(self, url):
+        """Handle a 304: refresh the entry and return the cached body"""
+        with self.lock:
+            entry = self.index.get(url)
+            if not entry:
+                return None
+            try:
+                body = self._read_body(entry)
+            except OSError:
+                del self.index[url]
+                return None
+            entry['stored_at'] = entry['last_used'] = time.time()
+            self.revalidated += 1
+            self._save_index()
+            return body
+
+    def store(self, url, body, response_headers):
+        """Save a 200 response and evict least recently used entries over max_bytes"""
+        with self.lock:
+            self.misses += 1
+            entry = {
+                'file': hashlib.sha1(url.encode('utf-8')).hexdigest() + ".body",
+                'etag': response_headers.get('ETag'),
+                'last_modified': response_headers.get('Last-Modified'),
+                'stored_at': time.time(),
+                'last_used': time.time(),
+                'size': len(body.encode('utf-8')),
+            }
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(self._body_path(entry), 'w', encoding='utf-8') as f:
+                    f.write(body)
+                self.index[url] = entry
+
+                total = sum(item['size'] for item in self.index.values())
+                for old_url in sorted(self.index, key=lambda u: self.index[u]['last_used']):
+                    if total <= self.max_bytes:
+                        break
+                    old_entry = self.index.pop(old_url)
+                    total -= old_entry['size']
+                    try:
+                        os.remove(self._body_path(old_entry))
+                    except OSError:
+                        pass
+                self._save_index()
+            except OSError as e:
+                print(f"⚠️ Could not write HTTP cache: {e}")
+
+    def summary(self):
+        return f"{self.hits} hits, {self.revalidated} revalidated (304), {self.misses} misses"
+
+
+class ScoreHistoryStore:
+    """Append-only JSONL score history with a per-round offset index
+
+    score_history.jsonl holds one entry per line and is never rewritten;
+    score_history.idx.json maps each round to the byte offset of its latest
+    entry (plus the offset of the last line), so appends, "last entry" and
+    "latest entry per round" reads never scan the whole log.
+    """
+
+    def __init__(self, log_file="score_history.jsonl", legacy_file="score_history.json"):
+        self.log_file = log_file
+        self.index_file = os.path.splitext(log_file)[0] + ".idx.json"
+        self.legacy_file = legacy_file
+        self.index = None
+
+    def _empty_index(self):
+        return {'size': 0, 'last': None, 'rounds': {}}
+
+    def _save_index(self):
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    def _index_entry(self, index, offset, entry):
+        """Point the entry's round at this offset if it is the latest for that round"""
+        round_key = str(entry.get('round', 0))
+        timestamp = entry.get('timestamp', '')
+        current = index['rounds'].get(round_key)
+        if current is None or timestamp > current[1]:
+            index['rounds'][round_key] = [offset, timestamp]
+        index['last'] = offset
+
+    def _load(self):
+        """Load the index, migrating the legacy JSON file or rebuilding after a crash"""
+        if self.index is not None:
+            return self.index
+
+        if not os.path.exists(self.log_file) and self.legacy_file and os.path.exists(self.legacy_file):
+            self.migrate_legacy()
+
+        index = None
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except Exception:
+                index = None
+
+        log_size = os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0
+        if index is None or index.get('size') != log_size:
+            # Index missing or behind the log (interrupted write): rebuild it once
+            index = self._empty_index()
+            for offset, entry in self._scan():
+                self._index_entry(index, offset, entry)
+            index['size'] = log_size
+            self.index = index
+            if log_size:
+                self._save_index()
+        self.index = index
+        return index
+
+    def _scan(self):
+        """Yield (offset, entry) for every line of the log"""
+        if not os.path.exists(self.log_file):
+            return
+        with open(self.log_file, 'rb') as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    yield offset, json.loads(line.decode('utf-8'))
+                offset += len(line)
+
+    def _read_at(self, f, offset):
+        f.seek(offset)
+        return json.loads(f.readline().decode('utf-8'))
+
+    def migrate_legacy(self):
+        """Convert the old score_history.json list into the JSONL log (the old file is kept)"""
+        with open(self.legacy_file, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+        self.index = self._empty_index()
+        with open(self.log_file, 'wb') as f:
+            for entry in history:
+                offset = f.tell()
+                f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8'))
+                self._index_entry(self.index, offset, entry)
+            self.index['size'] = f.tell()
+        self._save_index()
+        print(f"📦 Migrated {len(history)} history entries from {self.legacy_file} to {self.log_file}")
+
+    def append(self, entry):
+        """Append one entry in O(1)"""
+        index = self._load()
+        with open(self.log_file, 'ab') as f:
+            offset = f.tell()
+            f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8'))
+            index['size'] = f.tell()
+        self._index_entry(index, offset, entry)
+        self._save_index()
+
+    def last_entry(self):
+        """Most recently appended entry (None for an empty history)"""
+        index = self._load()
+        if index['last'] is None:
+            return None
+        with open(self.log_file, 'rb') as f:
+            return self._read_at(f, index['last'])
+
+    def latest_per_round(self, first_round=None, last_round=None):
+        """Latest entry of each round, sorted by round, optionally limited to a round range"""
+        index = self._load()
+        rounds = sorted((int(round_key), offset) for round_key, (offset, _) in index['rounds'].items())
+        if first_round is not None:
+            rounds = [item for item in rounds if item[0] >= first_round]
+        if last_round is not None:
+            rounds = [item for item in rounds if item[0] <= last_round]
+        if not rounds:
+            return []
+        with open(self.log_file, 'rb') as f:
+            return [self._read_at(f, offset) for _, offset in rounds]
+
+    def entries(self):
+        """Every entry ever appended, in order"""
+        return [entry for _, entry in self._scan()]
+
+    def replace(self, entries):
+        """Rewrite the whole log with `entries` (a re-scored history), atomically"""
+        tmp_file = self.log_file + ".tmp"
+        index = self._empty_index()
+        with open(tmp_file, 'wb') as f:
+            for entry in entries:
+                offset = f.tell()
+                f.write((json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8'))
+                self._index_entry(index, offset, entry)
+            index['size'] = f.tell()
+        os.replace(tmp_file, self.log_file)
+        self.index = index
+        self._save_index()
+
+
+class StandingsArchive:
+    """Append-only archive of every distinct standings table, stored as deltas
+
+    standings_archive.jsonl holds one snapshot per line. Every KEYFRAME_EVERY
+    snapshots (and whenever the teams change) a line carries the whole table;
+    the lines in between only carry what changed since the previous snapshot:
+    "moves" ([row, previous row] for the rows whose team changed) and
+    "points"/"games" ([row, difference] for the teams whose numbers changed).
+    standings_archive.idx.json keeps the offset, round, timestamp and keyframe
+    of each snapshot, so rebuilding any of them reads at most one keyframe and
+    KEYFRAME_EVERY - 1 deltas.
+    """
+
+    KEYFRAME_EVERY = 20
+
+    def __init__(self, log_file="standings_archive.jsonl"):
+        self.log_file = log_file
+        self.index_file = os.path.splitext(log_file)[0] + ".idx.json"
+        self.index = None
+        self._last = None  # table of the last snapshot, once decoded
+
+    @staticmethod
+    def _table(standings):
+        """Compact [team, points, games] rows, or None when the table does not fit that shape"""
+        table = []
+        for position, team_data in enumerate(standings, 1):
+            if set(team_data) != {'position', 'team', 'points', 'games'} or team_data['position'] != position:
+                return None
+            table.append([team_data['team'], team_data['points'], team_data['games']])
+        return table
+
+    @staticmethod
+    def _standings(table):
+        return [{'position': position, 'team': team, 'points': points, 'games': games}
+                for position, (team, points, games) in enumerate(table, 1)]
+
+    @staticmethod
+    def _numeric(table):
+        return all(isinstance(value, str) and value.isdigit() for row in table for value in row[1:])
+
+    def _delta(self, previous, table):
+        """Delta record fields from previous to table, None when only a keyframe can express it"""
+        if previous is None or previous == table or not (self._numeric(previous) and self._numeric(table)):
+            return None
+        previous_rows = {row[0]: i for i, row in enumerate(previous)}
+        if len(previous) != len(table) or set(previous_rows) != {row[0] for row in table}:
+            return None
+        delta = {}
+        moves = [[i, previous_rows[row[0]]] for i, row in enumerate(table) if previous[i][0] != row[0]]
+        if moves:
+            delta['moves'] = moves
+        for field, column in (('points', 1), ('games', 2)):
+            diffs = [[i, int(row[column]) - int(previous[previous_rows[row[0]]][column])]
+                     for i, row in enumerate(table) if row[column] != previous[previous_rows[row[0]]][column]]
+            if diffs:
+                delta[field] = diffs
+        return delta
+
+    @staticmethod
+    def _apply(previous, record):
+        """Table of a record, given the table of the snapshot before it"""
+        if 'table' in record:
+            return [list(row) for row in record['table']]
+        table = [list(row) for row in previous]
+        for i, previous_row in record.get('moves', ()):
+            table[i] = list(previous[previous_row])
+        for field, column in (('points', 1), ('games', 2)):
+            for i, diff in record.get(field, ()):
+                table[i][column] = str(int(table[i][column]) + diff)
+        return table
+
+    def _save_index(self):
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    def _load(self):
+        """Load the index, rebuilding it from the log if it is missing or behind"""
+        if self.index is not None:
+            return self.index
+        index = None
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except Exception:
+                index = None
+        log_size = os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0
+        if index is None or index.get('size') != log_size:
+            index = {'size': log_size, 'entries': []}
+            keyframe = 0
+            for offset, record in self._scan():
+                if 'table' in record:
+                    keyframe = len(index['entries'])
+                index['entries'].append([offset, record['round'], record['timestamp'], keyframe])
+            self.index = index
+            if log_size:
+                self._save_index()
+        self.index = index
+        return index
+
+    def _scan(self, offset=0):
+        """Yield (offset, record) for every line of the log from offset on"""
+        if not os.path.exists(self.log_file):
+            return
+        with open(self.log_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if line.strip():
+                    yield offset, json.loads(line.decode('utf-8'))
+                offset += len(line)
+
+    def __len__(self):
+        return len(self._load()['entries'])
+
+    def snapshots(self):
+        """(round, timestamp) of every archived snapshot, oldest first"""
+        return [(round_num, timestamp) for _, round_num, timestamp, _ in self._load()['entries']]
+
+    def _table_at(self, i):
+        entries = self._load()['entries']
+        keyframe = entries[i][3]
+        table = None
+        for n, (_, record) in enumerate(self._scan(entries[keyframe][0]), keyframe):
+            table = self._apply(table, record)
+            if n == i:
+                return table
+
+    def get(self, i):
+        """Standings of the i-th snapshot (negative indexes count from the end)"""
+        entries = self._load()['entries']
+        i = range(len(entries))[i]
+        if i == len(entries) - 1:
+            return self._standings(self._last_table())
+        return self._standings(self._table_at(i))
+
+    def at_round(self, round_num):
+        """Standings of the latest snapshot of a round (None if the round was never archived)"""
+        matches = [i for i, entry in enumerate(self._load()['entries']) if entry[1] == round_num]
+        return self.get(matches[-1]) if matches else None
+
+    def _last_table(self):
+        if self._last is None and len(self):
+            self._last = self._table_at(len(self) - 1)
+        return self._last
+
+    def iter_snapshots(self):
+        """Yield {'round', 'timestamp', 'standings'} for every snapshot in one pass over the log"""
+        table = None
+        for _, record in self._scan():
+            table = self._apply(table, record)
+            yield {'round': record['round'], 'timestamp': record['timestamp'], 'standings': self._standings(table)}
+
+    def append(self, standings, round_num, timestamp):
+        """Archive a table unless it equals the last one; True when a snapshot was added"""
+        table = self._table(standings)
+        if table is None:
+            # Not in the parser's shape: store its team/points/games as a keyframe
+            record = {'round': round_num, 'timestamp': timestamp,
+                      'table': [[team_data.get('team'), team_data.get('points'), team_data.get('games')]
+                                for team_data in standings]}
+            table = record['table']
+        else:
+            previous = self._last_table()
+            if previous == table:
+                return False
+            entries = self._load()['entries']
+            delta = None
+            if entries and len(entries) - entries[-1][3] < self.KEYFRAME_EVERY:
+                delta = self._delta(previous, table)
+            record = {'round': round_num, 'timestamp': timestamp}
+            record.update(delta if delta is not None else {'table': table})
+
+        index = self._load()
+        with open(self.log_file, 'ab') as f:
+            offset = f.tell()
+            f.write((json.dumps(record, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8'))
+            index['size'] = f.tell()
+        keyframe = len(index['entries']) if 'table' in record else index['entries'][-1][3]
+        index['entries'].append([offset, round_num, timestamp, keyframe])
+        self._save_index()
+        self._last = [list(row) for row in table]
+        return True
+
+
+# Lines around the generated results block of README.md
+RESULTS_BEGIN = "<!-- bolao:resultados:inicio -->"
+RESULTS_END = "<!-- bolao:resultados:fim -->"
+UPDATED_LABEL = "**Última Atualização:**"
+
+
+class MarkedSection:
+    """Generated block of a text file between a begin and an end marker line
+
+    The file is streamed line by line into a temp file next to it and renamed
+    over it, so readers never see a half-written file. A file without markers
+    yet is migrated: the legacy_heading section (up to the next '## ' heading)
+    is replaced, or the block goes right after the '# ' title. The block is
+    written with the line ending the file already uses (CRLF on a Windows
+    checkout), so a file never ends up with mixed endings. Lines starting
+    with volatile_prefix (an update timestamp) are not compared: a block
+    differing only there is not rewritten, and the old line stays.
+    """
+
+    def __init__(self, path, begin_marker, end_marker, legacy_heading=None, volatile_prefix=None):
+        self.path = path
+        self.begin_marker = begin_marker
+        self.end_marker = end_marker
+        self.legacy_heading = legacy_heading
+        self.volatile_prefix = volatile_prefix
+        self.newline = "\n"
+
+    def _detect_newline(self):
+        """Line ending of the file's first line ("\n" when it has none)"""
+        with open(self.path, 'rb') as f:
+            first = f.readline()
+        return "\r\n" if first.endswith(b"\r\n") else "\n"
+
+    def _write_block(self, out, lines):
+        for line in lines:
+            out.write(line + self.newline)
+
+    def _write_marked_block(self, out, lines):
+        out.write(self.begin_marker + self.newline)
+        self._write_block(out, lines)
+        out.write(self.end_marker + self.newline)
+
+    def _volatile(self, old, new):
+        """Both lines are the volatile one (they may differ)"""
+        prefix = self.volatile_prefix
+        return prefix is not None and old.startswith(prefix) and new.startswith(prefix)
+
+    def _splice(self, out, lines):
+        """Copy the file into out with the block replaced; 'same', 'changed' or 'missing'"""
+        state = 'before'
+        same = True
+        old_count = 0
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            for line in f:
+                text = line.rstrip('\r\n')
+                if state == 'inside':
+                    if text.strip() == self.end_marker:
+                        same = same and old_count == len(lines)
+                        out.write(line)
+                        state = 'after'
+                    else:
+                        if old_count >= len(lines) or (line != lines[old_count] + self.newline
+                                                       and not self._volatile(text, lines[old_count])):
+                            same = False
+                        old_count += 1
+                    continue
+                if state == 'legacy':
+                    if not text.startswith('## '):
+                        continue
+                    state = 'after'
+                elif state == 'before' and text.strip() == self.begin_marker:
+                    out.write(line)
+                    self._write_block(out, lines)
+                    state = 'inside'
+                    continue
+                elif state == 'before' and self.legacy_heading and text.startswith(self.legacy_heading):
+                    self._write_marked_block(out, lines)
+                    state = 'legacy'
+                    same = False
+                    continue
+                out.write(line)
+
+        if state == 'inside':
+            raise ValueError(f"{self.path}: '{self.end_marker}' missing after '{self.begin_marker}'")
+        if state == 'before':
+            return 'missing'
+        return 'same' if same else 'changed'
+
+    def _insert_after_title(self, out, lines):
+        placed = False
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            for line in f:
+                out.write(line)
+                if not placed and line.startswith('# '):
+                    out.write(self.newline)
+                    self._write_marked_block(out, lines)
+                    placed = True
+        if not placed:
+            self._write_marked_block(out, lines)
+
+    def write(self, block):
+        """Splice block in; returns False, leaving the file untouched, when it is already there"""
+        lines = block.split("\n")
+        self.newline = self._detect_newline()
+        fd, temp_path = tempfile.mkstemp(prefix=".section-", suffix=".tmp",
+                                         dir=os.path.dirname(os.path.abspath(self.path)))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as out:
+                status = self._splice(out, lines)
+                if status == 'missing':
+                    out.seek(0)
+                    out.truncate()
+                    self._insert_after_title(out, lines)
+                out.flush()
+                os.fsync(out.fileno())
+            if status == 'same':
+                os.remove(temp_path)
+                return False
+            os.chmod(temp_path, os.stat(self.path).st_mode & 0o7777)
+            os.replace(temp_path, self.path)
+            return True
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+class LazyRows:
+    """Read-only sequence whose rows are built on first access"""
+
+    def __init__(self, count, build_row):
+        self._rows = [None] * count
+        self._build_row = build_row
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        row = self._rows[i]
+        if row is None:
+            row = self._rows[i] = self._build_row(i)
+        return row
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self._rows)))
+
+
+class ScoreSheet:
+    """Result of scoring one standings table against every player at once"""
+
+    def __init__(self, players, predicted, scores, raw_scores, normalized_scores, moved_teams=None):
+        self.players = players
+        # predicted[row][player_index] / scores[row][player_index], one row per standings entry
+        # (None when the player did not predict that team)
+        self.predicted = predicted
+        self.scores = scores
+        self.raw_scores = raw_scores
+        self.normalized_scores = normalized_scores
+        # Teams whose position changed when the totals were updated incrementally
+        # (None after a full recompute)
+        self.moved_teams = moved_teams
+
+
+class PredictionIndex:
+    """Validated, inverted view of bolao.json: predicted position per player per team id"""
+
+    def __init__(self, data, normalize_team_name=None):
+        if not isinstance(data, dict):
+            raise ValueError("predictions must be a JSON object of players")
+        normalize = normalize_team_name or (lambda name: name)
+
+        self.players = list(data.keys())
+        self.player_ids = {player: i for i, player in enumerate(self.players)}
+        self.teams = []
+        self.team_ids = {}
+        self.positions = []
+
+        for player in self.players:
+            player_predictions = data[player]
+            if not isinstance(player_predictions, dict):
+                raise ValueError(f"{player}: predictions must be an object of position -> team")
+
+            # Positions must be exactly 1..N
+            try:
+                by_position = {int(pos): team for pos, team in player_predictions.items()}
+            except (TypeError, ValueError):
+                raise ValueError(f"{player}: positions must be integers")
+            if sorted(by_position) != list(range(1, len(by_position) + 1)):
+                raise ValueError(f"{player}: positions must be 1..{len(by_position)} without gaps")
+
+            if not self.team_ids:
+                # The first player defines the canonical team list
+                for pos in sorted(by_position):
+                    team = normalize(by_position[pos])
+                    if team in self.team_ids:
+                        raise ValueError(f"{player}: duplicate team '{team}'")
+                    self.team_ids[team] = len(self.teams)
+                    self.teams.append(team)
+
+            if len(by_position) != len(self.teams):
+                raise ValueError(f"{player}: expected {len(self.teams)} teams, found {len(by_position)}")
+
+            row = array('H', bytes(2 * len(self.teams)))
+            for pos, team in by_position.items():
+                team = normalize(team)
+                team_id = self.team_ids.get(team)
+                if team_id is None:
+                    raise ValueError(f"{player}: unknown team '{team}'")
+                if row[team_id]:
+                    raise ValueError(f"{player}: duplicate team '{team}'")
+                row[team_id] = pos
+            self.positions.append(row)
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players)
+
+    def __contains__(self, player):
+        return player in self.player_ids
+
+    def keys(self):
+        return list(self.players)
+
+    def predicted_position(self, player, team):
+        """Predicted position of a canonical team for a player (None if not predicted)"""
+        team_id = self.team_ids.get(team)
+        if team_id is None:
+            return None
+        return self.positions[self.player_ids[player]][team_id]
+
+    def player_predictions(self, player):
+        """Predictions of a player as {position: team}, ordered by position"""
+        row = self.positions[self.player_ids[player]]
+        return {pos: self.teams[team_id] for team_id, pos in sorted(enumerate(row), key=lambda x: x[1])}
+
+    def digest(self):
+        """SHA-256 of the players, teams and every prediction (identifies a pool's contents)"""
+        sha = hashlib.sha256(json.dumps([self.players, self.teams], ensure_ascii=False).encode('utf-8'))
+        for row in self.positions:
+            sha.update(row.tobytes())
+        return sha.hexdigest()
+
+
+class ScoreEngine:
+    """Scores every player at once from the positions matrix of a PredictionIndex
+
+    The engine remembers the team positions and player totals of its last
+    evaluation: when only a few teams moved, the totals are updated with the
+    score deltas of those teams (O(players x moved teams)) instead of being
+    summed again over the whole matrix. With numpy, both are one gather of
+    the per-deviation scores over the (teams, players) positions matrix; the
+    stdlib arrays are the fallback.
+    """
+
+    def __init__(self, index, calculate_score, normalize_score):
+        self.players = index.players
+        self.player_ids = index.player_ids
+        self.teams = index.teams
+        self.team_ids = index.team_ids
+        self.positions = index.positions
+        self.max_position = len(index.teams)
+        self.calculate_score = calculate_score
+        self.normalize_score = normalize_score
+        self.digest = index.digest()
+
+        self._score_lookup = []
+        self._matrix = None        # numpy (teams, players) predicted positions, 0 = not predicted
+        self._predicted_rows = {}  # team id -> predicted position per player
+        self._score_rows = {}      # team id -> (actual position, score per player)
+        self._state = None         # (team id -> actual position, totals) of the last evaluation
+
+    def _lookup(self, max_deviation):
+        """Per-deviation score table built from calculate_score (the reference rule)"""
+        lookup = self._score_lookup
+        for deviation in range(len(lookup), max_deviation + 1):
+            lookup.append(self.calculate_score(0, deviation))
+        return lookup
+
+    def _gather_totals(self, team_ids, actual_positions, lookup):
+        """numpy: per-player sum of the scores of the given teams at the given positions"""
+        if self._matrix is None:
+            flat = np.frombuffer(b''.join(row.tobytes() for row in self.positions), dtype=np.uint16)
+            self._matrix = flat.reshape(len(self.positions), len(self.teams)).T.astype(np.intp)
+        if not team_ids:
+            return np.zeros(len(self.players), dtype=np.int64)
+        scores = np.array(lookup + [0])  # trailing 0: teams a player did not predict
+        predicted = self._matrix[np.array(team_ids, dtype=np.intp)]
+        deviation = np.abs(predicted - np.array(actual_positions, dtype=np.intp)[:, None])
+        deviation[predicted == 0] = len(lookup)
+        return scores[deviation].sum(axis=0)
+
+    def _predicted_row(self, team_id):
+        row = self._predicted_rows.get(team_id)
+        if row is None:
+            row = self._predicted_rows[team_id] = [positions[team_id] or None for positions in self.positions]
+        return row
+
+    def _score_row(self, team_id, actual_pos, lookup, keep=True):
+        """Score of every player for a team at actual_pos (kept as that team's current row)"""
+        cached = self._score_rows.get(team_id)
+        if cached is not None and cached[0] == actual_pos:
+            return cached[1]
+        row = [lookup[abs(pos - actual_pos)] if pos else None for pos in self._predicted_row(team_id)]
+        if keep:
+            self._score_rows[team_id] = (actual_pos, row)
+        return row
+
+    def has_state(self):
+        return self._state is not None
+
+    def snapshot(self):
+        """Team positions and totals of the last evaluation, JSON-ready (None before any)"""
+        if self._state is None:
+            return None
+        team_positions, totals = self._state
+        return {
+            'predictions': self.digest,
+            'positions': {self.teams[team_id]: pos for team_id, pos in team_positions.items()},
+            'raw_scores': list(totals),
+        }
+
+    def restore(self, snapshot):
+        """Seed the delta state from a snapshot() of an earlier run; False if it does not fit"""
+        if not snapshot or snapshot.get('predictions') != self.digest:
+            return False
+        totals = snapshot.get('raw_scores')
+        positions = snapshot.get('positions') or {}
+        if not isinstance(totals, list) or len(totals) != len(self.players):
+            return False
+        team_positions = {}
+        for team, pos in positions.items():
+            team_id = self.team_ids.get(team)
+            if team_id is None:
+                return False
+            team_positions[team_id] = pos
+        self._state = (team_positions, list(totals))
+        return True
+
+    def evaluate(self, actual_standings, normalize_team_name, incremental=True):
+        """Score every player against the standings
+
+        With incremental=False (or nothing to start from, or a different set of
+        teams) the totals are recomputed from scratch over every team.
+        """
+        columns = []
+        actual_positions = []
+        for team_data in actual_standings:
+            team_name = normalize_team_name(team_data['team'])
+            columns.append(self.team_ids.get(team_name))
+            actual_positions.append(team_data['position'])
+
+        max_actual = max(actual_positions, default=0)
+        lookup = self._lookup(max(self.max_position, max_actual))
+        team_positions = {team_id: pos for team_id, pos in zip(columns, actual_positions) if team_id is not None}
+        unique_teams = len(team_positions) == sum(team_id is not None for team_id in columns)
+
+        moved_teams = None
+        if incremental and unique_teams and self._state is not None and self._state[0].keys() == team_positions.keys():
+            last_positions, totals = self._state
+            moved = [(team_id, last_positions[team_id], actual_pos)
+                     for team_id, actual_pos in team_positions.items() if last_positions[team_id] != actual_pos]
+            moved_teams = [self.teams[team_id] for team_id, _, _ in moved]
+            if moved and load_numpy():
+                moved_ids = [team_id for team_id, _, _ in moved]
+                delta = (self._gather_totals(moved_ids, [new for _, _, new in moved], lookup)
+                         - self._gather_totals(moved_ids, [old for _, old, _ in moved], lookup))
+                totals = (np.array(totals) + delta).tolist()
+            else:
+                totals = list(totals)
+                for team_id, old_pos, actual_pos in moved:
+                    old_row = self._score_row(team_id, old_pos, lookup, keep=False)
+                    new_row = self._score_row(team_id, actual_pos, lookup)
+                    for i, (old, new) in enumerate(zip(old_row, new_row)):
+                        if old != new:
+                            totals[i] += (new or 0) - (old or 0)
+        elif load_numpy():
+            known = [(team_id, pos) for team_id, pos in zip(columns, actual_positions) if team_id is not None]
+            totals = self._gather_totals([team_id for team_id, _ in known], [pos for _, pos in known],
+                                         lookup).tolist()
+        else:
+            totals = [0] * len(self.players)
+            for team_id, actual_pos in zip(columns, actual_positions):
+                if team_id is None:
+                    continue
+                for i, score in enumerate(self._score_row(team_id, actual_pos, lookup)):
+                    if score is not None:
+                        totals[i] += score
+        self._state = (team_positions, totals)
+
+        # Rows for the renderers, built only when something reads them
+        empty_row = [None] * len(self.players)
+
+        def predicted_row(row):
+            team_id = columns[row]
+            return empty_row if team_id is None else self._predicted_row(team_id)
+
+        def score_row(row):
+            team_id = columns[row]
+            return empty_row if team_id is None else self._score_row(team_id, actual_positions[row], lookup)
+
+        raw_scores = dict(zip(self.players, totals))
+        # Totals repeat a lot: normalize each distinct one once
+        normalized = {raw: self.normalize_score(raw) for raw in set(totals)}
+        normalized_scores = {player: normalized[raw] for player, raw in zip(self.players, totals)}
+        return ScoreSheet(self.players, LazyRows(len(columns), predicted_row), LazyRows(len(columns), score_row),
+                          raw_scores, normalized_scores, moved_teams)
+
+
+def solve_assignment(cost):
+    """Minimum-cost perfect assignment of a square cost matrix (Hungarian algorithm, O(n^3))
+
+    Returns (total cost, column assigned to each row).
+    """
+    n = len(cost)
+    infinity = float('inf')
+    u = [0] * (n + 1)
+    v = [0] * (n + 1)
+    owner = [0] * (n + 1)  # row (1-based) holding each column, 0 = free
+    way = [0] * (n + 1)
+    columns = range(1, n + 1)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        min_slack = [infinity] * (n + 1)
+        used = [False] * (n + 1)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            row = cost[i0 - 1]
+            u_i0 = u[i0]
+            delta = infinity
+            j1 = 0
+            for j in columns:
+                if not used[j]:
+                    slack = row[j - 1] - u_i0 - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = j0
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        j1 = j
+            for j in range(n + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+    assignment = [0] * n
+    for j in columns:
+        assignment[owner[j] - 1] = j - 1
+    return sum(cost[i][assignment[i]] for i in range(n)), assignment
+
+
+def solve_assignments(costs):
+    """solve_assignment over a (problems, n, n) numpy stack, all problems stepped together
+
+    Same algorithm, with each step vectorized over the problems still
+    searching for their augmenting path. Returns the minimum total per problem.
+    """
+    k, n = costs.shape[0], costs.shape[1]
+    u = np.zeros((k, n + 1))
+    v = np.zeros((k, n + 1))
+    owner = np.zeros((k, n + 1), dtype=np.intp)
+    way = np.zeros((k, n + 1), dtype=np.intp)
+    problems = np.arange(k)
+    for i in range(1, n + 1):
+        owner[:, 0] = i
+        j0 = np.zeros(k, dtype=np.intp)
+        min_slack = np.full((k, n + 1), np.inf)
+        used = np.zeros((k, n + 1), dtype=bool)
+        active = problems
+        while active.size:
+            used[active, j0[active]] = True
+            i0 = owner[active, j0[active]]
+            slack = costs[active, i0 - 1] - u[active, i0][:, None] - v[active, 1:]
+            free = ~used[active, 1:]
+            improved = free & (slack < min_slack[active, 1:])
+            min_slack[active, 1:] = np.where(improved, slack, min_slack[active, 1:])
+            way[active, 1:] = np.where(improved, j0[active][:, None], way[active, 1:])
+            candidates = np.where(free, min_slack[active, 1:], np.inf)
+            j1 = candidates.argmin(axis=1) + 1
+            delta = candidates[np.arange(active.size), j1 - 1]
+            rows, columns = np.nonzero(used[active])
+            u[active[rows], owner[active[rows], columns]] += delta[rows]  # distinct rows per problem
+            v[active] -= np.where(used[active], delta[:, None], 0)
+            min_slack[active] -= np.where(used[active], 0, delta[:, None])
+            j0[active] = j1
+            active = active[owner[active, j1] != 0]
+        # Flip the augmenting paths
+        flipping = problems
+        while flipping.size:
+            j1 = way[flipping, j0[flipping]]
+            owner[flipping, j0[flipping]] = owner[flipping, j1]
+            j0[flipping] = j1
+            flipping = flipping[j1 != 0]
+    assignment = np.zeros((k, n), dtype=np.intp)
+    assignment[problems[:, None], owner[:, 1:] - 1] = np.arange(n)
+    return costs[problems[:, None], np.arange(n), assignment].sum(axis=1)
+
+
+class SeasonOutcomes:
+    """Final positions each team can still reach, and the score range that leaves each player
+
+    A team finishes between lo (best) and hi (worst): every team already out
+    of its reach on points (current points > its points + 3 x games left) is
+    certainly above it; teams with nothing left to play keep the current
+    table's order. Each player's best (worst) final score is then a max (min)
+    weight assignment of teams to positions within those ranges. Blocks of
+    positions no team can leave are solved independently; a block where every
+    team can take any position is solved by sorting when the score is concave
+    in the deviation (the default rule), and by solve_assignment otherwise.
+    Because the ranges ignore head-to-head coupling, the bounds can only be
+    wider than the truly reachable ones, never narrower: an eliminated player
+    is really out.
+    """
+
+    FORBIDDEN = 10 ** 6
+    NUMPY_MIN_PLAYERS = 32  # below this the per-step numpy overhead outweighs solving players one by one
+
+    def __init__(self, standings, total_rounds=None):
+        n = len(standings)
+        self.size = n
+        total_rounds = total_rounds or 2 * (n - 1)
+        try:
+            points = [int(team_data['points']) for team_data in standings]
+            games = [int(team_data.get('games') or 0) for team_data in standings]
+        except (KeyError, TypeError, ValueError):
+            points = None
+
+        self.lo = [1] * n
+        self.hi = [n] * n
+        if points is not None:
+            remaining = [max(0, total_rounds - played) for played in games]
+            top = [p + 3 * left for p, left in zip(points, remaining)]
+
+            def above(j, i):
+                """Team j certainly finishes above team i"""
+                if points[j] > top[i]:
+                    return True
+                return (remaining[i] == remaining[j] == 0 and points[j] == points[i]
+                        and standings[j]['position'] < standings[i]['position'])
+
+            lo = [1 + sum(above(j, i) for j in range(n) if j != i) for i in range(n)]
+            hi = [n - sum(above(i, j) for j in range(n) if j != i) for i in range(n)]
+            # The current table must be one of the reachable orders; if it is
+            # not (unsorted or odd source data), keep the unconstrained ranges
+            positions = [team_data['position'] for team_data in standings]
+            if sorted(positions) == list(range(1, n + 1)) and \
+                    all(lo[i] <= positions[i] <= hi[i] for i in range(n)):
+                self.lo, self.hi = lo, hi
+
+        self.blocks = self._blocks()
+
+    def _blocks(self):
+        """Split positions into independent (rows, first position, free) blocks"""
+        blocks = []
+        order = sorted(range(self.size), key=lambda i: (self.lo[i], self.hi[i]))
+        start = 0
+        reach = 0
+        for k, i in enumerate(order, 1):
+            reach = max(reach, self.hi[i])
+            # Rows order[start:k] need exactly the positions start+1..k
+            if reach == k and (k == self.size or self.lo[order[k]] > k):
+                rows = order[start:k]
+                free = all(self.lo[i] == start + 1 and self.hi[i] == k for i in rows)
+                blocks.append((rows, start + 1, free))
+                start = k
+        return blocks
+
+    @staticmethod
+    def _concave(lookup):
+        """Score non-increasing and concave in the deviation (sorted matching is then optimal)"""
+        drops = [lookup[d] - lookup[d + 1] for d in range(len(lookup) - 1)]
+        return all(drop >= 0 for drop in drops) and all(a <= b for a, b in zip(drops, drops[1:]))
+
+    def _block_bounds(self, rows, first, free, predicted, lookup, sortable):
+        """(best, worst) total over one block for one player's predicted positions"""
+        positions = range(first, first + len(rows))
+        if len(rows) == 1:
+            pred = predicted[0]
+            score = lookup[abs(pred - first)] if pred is not None else 0
+            return score, score
+        if free and sortable and None not in predicted:
+            ordered = sorted(predicted)
+            best = sum(lookup[abs(pred - pos)] for pred, pos in zip(ordered, positions))
+            worst = sum(lookup[abs(pred - pos)] for pred, pos in zip(ordered, reversed(positions)))
+            return best, worst
+        forbidden = self.FORBIDDEN
+        scores = [[(lookup[abs(pred - pos)] if pred is not None else 0)
+                   if self.lo[row] <= pos <= self.hi[row] else None for pos in positions]
+                  for row, pred in zip(rows, predicted)]
+        best, _ = solve_assignment([[-score if score is not None else forbidden for score in line] for line in scores])
+        worst, _ = solve_assignment([[score if score is not None else forbidden for score in line] for line in scores])
+        return -best, worst
+
+    def _player_bounds_numpy(self, predicted_rows, players, lookup, sortable, max_cells=4000000):
+        """player_bounds with numpy: each block solved at once for every distinct prediction column"""
+        scores = np.array(lookup + [0])  # trailing 0: teams a player did not predict
+        best = np.zeros(len(players), dtype=np.int64)
+        worst = np.zeros(len(players), dtype=np.int64)
+        for rows, first, free in self.blocks:
+            block = np.array([predicted_rows[row] for row in rows], dtype=float)  # None -> nan
+            columns, inverse = np.unique(np.nan_to_num(block, nan=0).astype(np.intp), axis=1, return_inverse=True)
+            size = len(rows)
+            positions = np.arange(first, first + size)
+            if free and sortable and columns.all():
+                ordered = np.sort(columns, axis=0)
+                block_best = scores[np.abs(ordered - positions[:, None])].sum(axis=0)
+                block_worst = scores[np.abs(ordered - positions[::-1, None])].sum(axis=0)
+            else:
+                lo = np.array([self.lo[row] for row in rows])[:, None]
+                hi = np.array([self.hi[row] for row in rows])[:, None]
+                allowed = (lo <= positions) & (positions <= hi)
+                block_best = np.empty(columns.shape[1], dtype=np.int64)
+                block_worst = np.empty(columns.shape[1], dtype=np.int64)
+                step = max(1, max_cells // (size * size))
+                for start in range(0, columns.shape[1], step):
+                    chunk = columns[:, start:start + step].T
+                    # (columns, rows, positions) score of each team at each position of the block
+                    deviation = np.abs(chunk[:, :, None] - positions)
+                    deviation[chunk == 0] = len(lookup)
+                    chunk_scores = scores[deviation]
+                    if size == 1:
+                        block_best[start:start + step] = block_worst[start:start + step] = chunk_scores[:, 0, 0]
+                        continue
+                    block_best[start:start + step] = -solve_assignments(np.where(allowed, -chunk_scores,
+                                                                                 self.FORBIDDEN))
+                    block_worst[start:start + step] = solve_assignments(np.where(allowed, chunk_scores,
+                                                                                self.FORBIDDEN))
+            inverse = inverse.reshape(-1)
+            best += block_best[inverse]
+            worst += block_worst[inverse]
+        return dict(zip(players, best.tolist())), dict(zip(players, worst.tolist()))
+
+    def player_bounds(self, predicted_rows, players, lookup):
+        """{player: best}, {player: worst} raw final scores from the sheet's predicted rows
+
+        With numpy, in large pools, the blocks are solved for every player at
+        once (solve_assignments); otherwise one block at a time per distinct
+        prediction of its teams.
+        """
+        sortable = self._concave(lookup)
+        if len(players) >= self.NUMPY_MIN_PLAYERS and load_numpy():
+            return self._player_bounds_numpy(predicted_rows, players, lookup, sortable)
+        best = [0] * len(players)
+        worst = [0] * len(players)
+        for rows, first, free in self.blocks:
+            block_rows = [predicted_rows[row] for row in rows]
+            memo = {}
+            for column, predicted in enumerate(zip(*block_rows)):
+                bounds = memo.get(predicted)
+                if bounds is None:
+                    bounds = memo[predicted] = self._block_bounds(rows, first, free, predicted, lookup, sortable)
+                best[column] += bounds[0]
+                worst[column] += bounds[1]
+        return dict(zip(players, best)), dict(zip(players, worst))
+
+
+class OutcomeBounds:
+    """Reachable final score range per player, and who is already out (or already champion)"""
+
+    def __init__(self, best, worst, normalize_score):
+        self.best = best
+        self.worst = worst
+        self.best_normalized = {player: normalize_score(score) for player, score in best.items()}
+        self.worst_normalized = {player: normalize_score(score) for player, score in worst.items()}
+
+        # Eliminated: someone else's worst case already beats this player's best case
+        self.eliminated = set()
+        self.champion = None
+        if len(best) > 1:
+            worst_sorted = sorted(worst.values(), reverse=True)
+            best_sorted = sorted(best.values(), reverse=True)
+            for player in best:
+                others_worst = worst_sorted[1] if worst[player] == worst_sorted[0] else worst_sorted[0]
+                others_best = best_sorted[1] if best[player] == best_sorted[0] else best_sorted[0]
+                if best[player] < others_worst:
+                    self.eliminated.add(player)
+                if worst[player] > others_best:
+                    self.champion = player
+
+
+# Built-in scoring rules (see ScoringRule); "padrao" is the rule calculate_score implements
+SCORING_RULES = {
+    'padrao': {'deviation_points': [20 - deviation for deviation in range(20)]},
+    'quadratico': {'deviation_points': [400 - deviation * deviation for deviation in range(20)]},
+    # Top 4 (Libertadores) and the relegation zone count double
+    'zonas': {'deviation_points': [20 - deviation for deviation in range(20)],
+              'zone_weights': [[1, 4, 2], [17, 20, 2]]},
+}
+
+
+class ScoringRule:
+    """A scoring rule as a points table: table[actual][predicted] for an n-team league
+
+    A spec is either {"deviation_points": [...]} (points by |deviation|, 0
+    past the end of the list), optionally with "zone_weights": [[first, last,
+    weight], ...] multiplying the points of teams that finish in a zone, or
+    {"matrix": [[...], ...]} with one row per actual position. Totals are
+    normalized between the lowest and highest total any final table can
+    give (found with solve_assignment): (raw - 200) / 2 for the default rule.
+    The name ends up in file names (score_history.<name>.jsonl), so it must
+    match NAME_PATTERN.
+    """
+
+    NAME_PATTERN = re.compile(r'[a-z0-9_-]+')
+
+    def __init__(self, name, spec):
+        if not isinstance(name, str) or not self.NAME_PATTERN.fullmatch(name):
+            raise ValueError(f"scoring rule name {name!r} must use only a-z, 0-9, '_' and '-'")
+        if not isinstance(spec, dict) or not (isinstance(spec.get('deviation_points'), list)
+                                              or isinstance(spec.get('matrix'), list)):
+            raise ValueError(f"scoring rule '{name}' needs a 'deviation_points' list or a 'matrix'")
+        self.name = name
+        self.spec = spec
+        self._tables = {}
+        self._bounds = {}
+
+    @classmethod
+    def load(cls, rule):
+        """Built-in rule by name, or a rule spec from a JSON file (named after the file)"""
+        if rule in SCORING_RULES:
+            return cls(rule, SCORING_RULES[rule])
+        if not os.path.exists(rule):
+            raise ValueError(f"unknown scoring rule '{rule}' (built-in: {', '.join(SCORING_RULES)})")
+        with open(rule, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+        return cls(spec.get('name') or os.path.splitext(os.path.basename(rule))[0], spec)
+
+    def table(self, n):
+        """(n+1) x (n+1) points table, row/column 0 (no position) scoring 0"""
+        table = self._tables.get(n)
+        if table is not None:
+            return table
+        matrix = self.spec.get('matrix')
+        if matrix is not None:
+            if len(matrix) < n or any(len(row) < n for row in matrix[:n]):
+                raise ValueError(f"scoring rule '{self.name}': matrix must be at least {n} x {n}")
+            rows = [list(row[:n]) for row in matrix[:n]]
+        else:
+            points = self.spec['deviation_points']
+            weights = [1] * n
+            for first, last, weight in self.spec.get('zone_weights', ()):
+                for actual in range(max(1, first), min(n, last) + 1):
+                    weights[actual - 1] = weight
+            rows = [[weights[actual - 1] * (points[abs(predicted - actual)] if abs(predicted - actual) < len(points) else 0)
+                     for predicted in range(1, n + 1)] for actual in range(1, n + 1)]
+        table = self._tables[n] = [[0] * (n + 1)] + [[0] + row for row in rows]
+        return table
+
+    def bounds(self, n):
+        """Lowest and highest total a player can get over every possible final table"""
+        bounds = self._bounds.get(n)
+        if bounds is None:
+            rows = [row[1:] for row in self.table(n)[1:]]
+            lowest, _ = solve_assignment(rows)
+            highest, _ = solve_assignment([[-points for points in row] for row in rows])
+            bounds = self._bounds[n] = (lowest, -highest)
+        return bounds
+
+    def normalize(self, raw_score, n):
+        lowest, highest = self.bounds(n)
+        if highest == lowest:
+            return 100
+        return max(0, min(100, round((raw_score - lowest) * 100 / (highest - lowest))))
+
+    def score_many(self, actual_tables, predicted, n, max_cells=4000000):
+        """Player totals for many final tables in one pass (vectorized with numpy when available)
+
+        actual_tables has one list per table with the final position of each
+        team id (0 when absent); predicted has one sequence per player with
+        the predicted position of each team id (0 when not predicted).
+        """
+        table = self.table(n)
+        if not actual_tables:
+            return []
+        if load_numpy():
+            points = np.array(table)
+            actual = np.array(actual_tables, dtype=np.intp)
+            by_team = np.array([list(row) for row in predicted], dtype=np.intp).T  # (teams, players)
+            step = max(1, max_cells // max(1, by_team.size))
+            totals = []
+            for start in range(0, len(actual), step):
+                chunk = actual[start:start + step]
+                totals.extend(points[chunk[:, :, None], by_team[None, :, :]].sum(axis=1).tolist())
+            return totals
+
+        by_team = list(zip(*predicted))
+        rows = {}
+        totals = []
+        for actual_positions in actual_tables:
+            player_totals = [0] * len(predicted)
+            for team_id, actual_pos in enumerate(actual_positions):
+                if not actual_pos:
+                    continue
+                key = (team_id, actual_pos)
+                row = rows.get(key)
+                if row is None:
+                    points = table[actual_pos]
+                    row = rows[key] = [points[pos] for pos in by_team[team_id]]
+                player_totals = [total + score for total, score in zip(player_totals, row)]
+            totals.append(player_totals)
+        return totals
+
+
+class SeasonSimulator:
+    """Monte Carlo projection of the final table from the current one (needs numpy)
+
+    Each team plays its remaining games (38 rounds minus games played) as
+    independent win/draw/loss draws. The win probability comes from points
+    per game, shrunk toward the league average by PRIOR_GAMES so that early
+    season tables are not taken at face value; the draw rate is fixed. Ties on
+    points are broken at random, except between teams with no games left,
+    which keep their current order. Opponents are not modelled: every team's
+    games are drawn independently of the others'.
+    """
+
+    DRAW_RATE = 0.26
+    PRIOR_GAMES = 5
+    LEAGUE_PPG = 1.37  # when no game has been played yet
+
+    def __init__(self, standings, total_rounds=None):
+        load_numpy()
+        n = len(standings)
+        total_rounds = total_rounds or 2 * (n - 1)
+        points = np.array([int(team_data.get('points') or 0) for team_data in standings], dtype=np.int64)
+        games = np.array([int(team_data.get('games') or 0) for team_data in standings], dtype=np.int64)
+        self.points = points
+        self.remaining = np.clip(total_rounds - games, 0, None)
+
+        league_ppg = points.sum() / games.sum() if games.sum() else self.LEAGUE_PPG
+        ppg = (points + self.PRIOR_GAMES * league_ppg) / (games + self.PRIOR_GAMES)
+        draw = self.DRAW_RATE
+        self.win = np.clip((ppg - draw) / 3, 0.02, 1 - draw - 0.02)
+        self.draw = draw
+
+        # Tie-break for finished teams: current order (earlier row wins)
+        self.finished = self.remaining == 0
+        self.fixed_tiebreak = 0.5 * (1 - np.arange(1, n + 1) / (n + 1))
+
+    def final_positions(self, seasons, rng):
+        """(seasons, teams) array of simulated final positions, teams in standings order"""
+        n = len(self.points)
+        games = int(self.remaining.max()) if n else 0
+        draws = rng.random((seasons, n, games))
+        played = np.arange(games) < self.remaining[:, None]
+        won = draws < self.win[:, None]
+        drawn = (draws >= self.win[:, None]) & (draws < (self.win + self.draw)[:, None])
+        points = self.points + ((3 * won + drawn) * played).sum(axis=2)
+
+        tiebreak = 0.5 * rng.random((seasons, n))
+        tiebreak[:, self.finished] = self.fixed_tiebreak[self.finished]
+        order = np.argsort(-(points + tiebreak), axis=1, kind='stable')
+        positions = np.empty_like(order)
+        np.put_along_axis(positions, order, np.arange(1, n + 1), axis=1)
+        return positions
+
+
+def simulate_chunk(simulator, predicted, lookup, seasons, seed, max_cells=4000000):
+    """Simulate `seasons` seasons and score them; returns (win shares, total scores) summed per player
+
+    predicted is a (teams, players) int array with 0 for a missing prediction;
+    lookup holds calculate_score by deviation plus a trailing 0 used for those.
+    """
+    load_numpy()  # spawned worker processes start without the parent's import
+    rng = np.random.default_rng(seed)
+    teams, players = predicted.shape
+    missing = predicted == 0
+    sentinel = len(lookup) - 1
+    wins = np.zeros(players)
+    totals = np.zeros(players)
+    # Bound the (seasons, teams, players) deviation block held in memory
+    step = max(1, max_cells // max(1, teams * players))
+    for start in range(0, seasons, step):
+        positions = simulator.final_positions(min(step, seasons - start), rng)
+        deviation = np.abs(positions[:, :, None] - predicted[None, :, :])
+        deviation[:, missing] = sentinel
+        scores = lookup[deviation].sum(axis=1)
+        best = scores == scores.max(axis=1, keepdims=True)
+        # A shared first place splits the win
+        wins += (best / best.sum(axis=1, keepdims=True)).sum(axis=0)
+        totals += scores.sum(axis=0)
+    return wins, totals
+
+
+class SimulationSummary:
+    """Win probability and expected final score per player over the simulated seasons"""
+
+    def __init__(self, players, seasons, wins, totals, normalize_score):
+        self.players = players
+        self.seasons = seasons
+        self.win_probability = {player: float(wins[i]) / seasons for i, player in enumerate(players)}
+        self.expected_raw = {player: float(totals[i]) / seasons for i, player in enumerate(players)}
+        self.expected_normalized = {player: normalize_score(score) for player, score in self.expected_raw.items()}
+        self.ranking = sorted(players, key=lambda player: (-self.win_probability[player], -self.expected_raw[player]))
+
+
+def render_simulation(summary):
+    """Console table of a SimulationSummary, most likely winner first"""
+    lines = [
+        f"🎲 {summary.seasons:,} simulated seasons",
+        f"{'':<4} {'Player':<24} {'Win %':>8} {'Expected':>10} {'Normalized':>11}",
+    ]
+    for rank, player in enumerate(summary.ranking, 1):
+        lines.append(f"{rank:<4} {player:<24} {100 * summary.win_probability[player]:>7.1f}% "
+                     f"{summary.expected_raw[player]:>10.1f} {summary.expected_normalized[player]:>11}")
+    return "\n".join(lines)
+
+
+class ResultsModel:
+    """Everything a run reports, computed once and shared by every renderer"""
+
+    def __init__(self, standings, sheet, current_round, updated=None, outcomes=None):
+        self.standings = standings
+        self.players = sheet.players  # prediction file order
+        self.predicted = sheet.predicted
+        self.scores = sheet.scores
+        self.raw_scores = sheet.raw_scores
+        self.normalized_scores = sheet.normalized_scores
+        self.round = current_round
+        self.updated = updated or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Highest raw score first; ties keep the prediction file order
+        self.ranking = sorted(self.players, key=lambda player: self.raw_scores[player], reverse=True)
+        self.player_ids = {player: i for i, player in enumerate(self.players)}
+        # OutcomeBounds of the rest of the season, or a callable computing it on first use
+        self._outcomes = outcomes
+
+    @property
+    def outcomes(self):
+        """Reachable final scores (OutcomeBounds), None when not computed for this run"""
+        if callable(self._outcomes):
+            self._outcomes = self._outcomes()
+        return self._outcomes
+
+    def rows(self):
+        """(team_data, predicted positions, scores) per standings row, player columns in file order"""
+        return zip(self.standings, self.predicted, self.scores)
+
+
+def render_console(results):
+    """Side-by-side terminal table, players in prediction file order"""
+    lines = [
+        "",
+        "🏆 BRASILEIRÃO 2025 - BOLÃO RESULTS",
+        f"Updated: {results.updated}",
+        "=" * 120,
+        f"{'Team':<20} {'Actual':<8}" + "".join(f"{player:<12}" for player in results.players),
+        "-" * 120,
+    ]
+    for team_data, predicted_row, score_row in results.rows():
+        cells = [f"{predicted_pos}°({score}p) " if predicted_pos is not None else "--       "
+                 for predicted_pos, score in zip(predicted_row, score_row)]
+        lines.append(f"{team_data['team']:<20} {team_data['position']:<8}" + "".join(cells))
+    lines.append("-" * 120)
+    lines.append(f"{'FINAL SCORES:':<20} {'':>8}"
+                 + "".join(f"{results.normalized_scores[player]:<12}" for player in results.players))
+    return "\n".join(lines)
+
+
+def render_markdown(results):
+    """README results table and medal ranking, players sorted by score"""
+    columns = [results.player_ids[player] for player in results.ranking]
+    lines = [
+        "## 🏆 Resultados Atuais",
+        "",
+        f"{UPDATED_LABEL} {results.updated}",
+        "",
+        "| Time | Real |" + "".join(f" {player} |" for player in results.ranking),
+        "|------|------|" + "------|" * len(results.ranking),
+    ]
+    for team_data, predicted_row, score_row in results.rows():
+        row = f"| {team_data['team']} | {team_data['position']} |"
+        for column in columns:
+            predicted_pos = predicted_row[column]
+            row += f" {predicted_pos}°({score_row[column]}p) |" if predicted_pos is not None else " -- |"
+        lines.append(row)
+    lines.append("| **TOTAL** | |" + "".join(f" **{results.raw_scores[player]}** |" for player in results.ranking))
+
+    lines.extend(["", "### 🏅 Classificação Final (pontuação normalizada 0-100)", ""])
+    for i, player in enumerate(results.ranking, 1):
+        medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
+        lines.append(f"{medal} **{player}**: {results.normalized_scores[player]} pontos"
+                     + outcome_note(results.outcomes, player))
+    return "\n".join(lines)
+
+
+def outcome_note(outcomes, player):
+    """Ranking suffix with the final score range still open to the player"""
+    if outcomes is None:
+        return ""
+    worst, best = outcomes.worst_normalized[player], outcomes.best_normalized[player]
+    note = f" _(final possível: {worst}–{best})_" if worst != best else ""
+    if player == outcomes.champion:
+        note += " 🏆 campeão garantido"
+    elif player in outcomes.eliminated:
+        note += " ❌ sem chances de título"
+    return note
+
+
+def ranking_entries(results):
+    """Ranking as JSON-ready dicts, with the reachable final range when it was computed"""
+    outcomes = results.outcomes
+    entries = []
+    for rank, player in enumerate(results.ranking, 1):
+        entry = {'rank': rank, 'player': player, 'raw_score': results.raw_scores[player],
+                 'normalized_score': results.normalized_scores[player]}
+        if outcomes is not None:
+            entry.update({'best_raw_score': outcomes.best[player], 'worst_raw_score': outcomes.worst[player],
+                          'best_normalized_score': outcomes.best_normalized[player],
+                          'worst_normalized_score': outcomes.worst_normalized[player],
+                          'eliminated': player in outcomes.eliminated,
+                          'clinched': player == outcomes.champion})
+        entries.append(entry)
+    return entries
+
+
+def render_json(results):
+    """Machine-readable results: standings with every prediction, plus the ranking"""
+    standings = []
+    for team_data, predicted_row, score_row in results.rows():
+        standings.append({
+            **team_data,
+            'predictions': {player: {'predicted': predicted_pos, 'score': score}
+                            for player, predicted_pos, score in zip(results.players, predicted_row, score_row)},
+        })
+    return json.dumps({'updated': results.updated, 'round': results.round,
+                       'ranking': ranking_entries(results), 'standings': standings}, indent=2, ensure_ascii=False)
+
+
+def render_csv(results):
+    """One line per player in ranking order: totals, then the points earned on each team"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(['rank', 'player', 'raw_score', 'normalized_score']
+                    + [team_data['team'] for team_data in results.standings])
+    for rank, player in enumerate(results.ranking, 1):
+        column = results.player_ids[player]
+        writer.writerow([rank, player, results.raw_scores[player], results.normalized_scores[player]]
+                        + [score_row[column] for score_row in results.scores])
+    return buffer.getvalue()
+
+
+# Output format -> renderer; the file outputs are written next to README.md
+RESULT_RENDERERS = {
+    'console': render_console,
+    'markdown': render_markdown,
+    'json': render_json,
+    'csv': render_csv,
+}
+RESULT_FILES = {
+    'json': "results.json",
+    'csv': "results.csv",
+}
+
+
+class BrasileiroScraper:
+    def __init__(self, sources=None, fetch_timeout=15, fetch_deadline=30,
+                 cache_dir=".http_cache", cache_ttl=300, cache_max_bytes=20 * 1024 * 1024,
+                 output_dir=".", outputs=()):
         # Create SSL context that doesn't verify certificates (for testing)
         self.ssl_context = ssl.create_default_context()
         self.ssl_context.check_hostname = False
         self.ssl_context.verify_mode = ssl.CERT_NONE
         
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept-Encoding': 'gzip, deflate, br' if BROTLI_AVAILABLE else 'gzip, deflate'
         }
+
+        # Pooled keep-alive client shared by every fetch of this scraper
+        self.http = HttpClient(self.ssl_context)
+
+        # Team names are resolved through the shared registry
+        self.teams = TEAM_REGISTRY
+
+        # On-disk response cache (None disables it)
+        self.http_cache = HttpCache(cache_dir, cache_ttl, cache_max_bytes) if cache_dir else None
+
+        # Standings sources, fetched concurrently (first valid table wins).
+        # Each entry: name, SOURCE_LAYOUTS key, url and optional per-source timeout.
+        if sources is None:
+            sources = [
+                {'name': "ESPN Brazil", 'layout': 'espn', 'url': SOURCE_LAYOUTS['espn']['url']},
+                {'name': "Gazeta Esportiva", 'layout': 'gazeta', 'url': SOURCE_LAYOUTS['gazeta']['url']},
+            ]
+        self.sources = sources
+        self.fetch_timeout = fetch_timeout    # seconds per request unless the source overrides it
+        self.fetch_deadline = fetch_deadline  # overall budget for get_current_standings
+
+        # Every file a pool reads or writes (README, history, chart, last
+        # standings) lives in output_dir, so several pools never collide
+        self.output_dir = output_dir
+
+        # Score history log (migrated from score_history.json on first use)
+        self.history_store = ScoreHistoryStore(self.output_path("score_history.jsonl"),
+                                               self.output_path("score_history.json"))
+        # Every distinct standings table, for re-scoring past rounds
+        self.standings_archive = StandingsArchive(self.output_path("standings_archive.jsonl"))
+
+        # Performance chart: rendered only when the history digest changes,
+        # reusing one figure template per process (SVG copy is optional)
+        self.chart_path = self.output_path("performance_chart.png")
+        self.chart_svg = False
+        self._chart = None
+        # One small chart per player in charts/ (off by default: one render per player)
+        self.player_charts = False
+        self.player_charts_dir = self.output_path("charts")
+        # Threads for the artifacts built alongside the README (charts, result files)
+        self.artifact_workers = 3
+
+        # Which source produced the last standings and the digest of its table
+        self.standings_source = None
+        self.fingerprints = {}
+
+        # Score engine compiled from the last predictions index we saw
+        self._score_engine = None
+        self._score_engine_source = None
+        # Pool digest -> (standings digest, OutcomeBounds) of the last outcomes computed for it
+        self._outcomes_cache = {}
+
+        # Stage timings and counters of the current run
+        self.metrics = RunMetrics()
+
+        # Extra RESULT_FILES formats written on every update (console and README always are)
+        self.outputs = list(outputs)
+
+        # Check every incremental re-score against a full recompute
+        self.verify_scores = False
+
+        # Outcome of the last run_comparison: 'updated', 'unchanged' or 'failed'
+        self.last_status = None
+        # Last PredictionIndex loaded, reused while its file is unchanged
+        self._predictions_cache = None
+
+        # Called as listener(scraper, results) after every scoring (e.g. ApiServer.publish)
+        self.result_listeners = []
+    
+    def output_path(self, filename):
+        """Path of a pool file inside this scraper's output directory"""
+        return os.path.join(self.output_dir, filename)
     
     def load_predictions(self, json_file="bolao.json"):
-        """Load player predictions from JSON file"""
+        """Load player predictions from JSON file into a PredictionIndex"""
         try:
             if not os.path.exists(json_file):
                 print(f"Predictions file not found: {json_file}")
                 return None
             
+            # Same file as last time (long-running watch mode): keep the index,
+            # and with it the warm score engine
+            stat = os.stat(json_file)
+            key = (os.path.abspath(json_file), stat.st_mtime_ns, stat.st_size)
+            if self._predictions_cache and self._predictions_cache[0] == key:
+                return self._predictions_cache[1]
+            
             with open(json_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
-            return data
+            # Build the team -> position index once and reject malformed pools up front
+            index = PredictionIndex(data, self.normalize_team_name)
+            self._predictions_cache = (key, index)
+            return index
         except Exception as e:
             print(f"Error loading predictions: {e}")
             return None
     
-    def fetch_url(self, url):
-        """Fetch URL content"""
+    def fetch_url(self, url, timeout=None, stop_marker=None, stop_when=None, cancelled=None):
+        """Fetch URL content, going through the HTTP cache when enabled
+
+        With stop_marker/stop_when the download ends as soon as stop_when
+        accepts the text received so far (checked each time stop_marker arrives).
+        Setting the `cancelled` event abandons the download (None is returned).
+        """
+        cache = self.http_cache
         try:
-            req = urllib.request.Request(url, headers=self.headers)
-            with urllib.request.urlopen(req, context=self.ssl_context) as response:
-                return response.read().decode('utf-8')
+            if cache:
+                body = cache.get_fresh(url)
+                if body is not None:
+                    return body
+            
+            headers = dict(self.headers)
+            if cache:
+                headers.update(cache.conditional_headers(url))
+            timeout = timeout or self.fetch_timeout
+            response = self.http.request(url, headers, timeout, stop_marker, stop_when, cancelled)
+            
+            if response.status == 304 and cache:
+                body = cache.not_modified(url)
+                if body is not None:
+                    return body
+            if response.status != 200:
+                raise http.client.HTTPException(f"HTTP Error {response.status}")
+            
+            if cache:
+                cache.store(url, response.text, response.headers)
+            return response.text
+        except RequestCancelled:
+            return None
         except Exception as e:
             print(f"Error fetching {url}: {e}")
             return None
     
     def scrape_espn_standings(self):
         """Scrape standings from ESPN Brazil"""
-        url = "https://www.espn.com.br/futebol/liga/_/nome/bra.1"
-        
-        print("Fetching standings from ESPN Brazil...")
-        html_content = self.fetch_url(url)
-        
-        if not html_content:
-            return None
-        
-        # Parse the HTML to extract standings
+        return self.scrape_source({'name': "ESPN Brazil", 'layout': 'espn', 'url': SOURCE_LAYOUTS['espn']['url']})
+    
+    def scrape_gazeta_standings(self):
+        """Scrape standings from Gazeta Esportiva"""
+        return self.scrape_source({'name': "Gazeta Esportiva", 'layout': 'gazeta', 'url': SOURCE_LAYOUTS['gazeta']['url']})
+    
+    def _pick_number(self, cells, spec):
+        """Pick a numeric column as described by a SOURCE_LAYOUTS field"""
+        if spec['pick'] == 'cell':
+            return cells[spec['index']] if cells else '0'
+        start, stop = spec['cells']
+        candidates = cells[start:stop]
+        if spec['pick'] == 'last':
+            candidates = reversed(candidates)
+        for cell in candidates:
+            if cell.isdigit() and int(cell) <= spec['max']:
+                return cell
+        return '0'
+    
+    def parse_standings(self, html_content, layout, max_teams=20):
+        """Parse a standings page in one pass using a SOURCE_LAYOUTS entry"""
         teams = []
+        from_link = layout['team']['from'] == 'link'
         
-        # Look for table rows with team data using regex
-        # This is a simplified approach - finding table rows
-        table_pattern = r'<tr[^>]*>.*?</tr>'
-        rows = re.findall(table_pattern, html_content, re.DOTALL | re.IGNORECASE)
-        
-        position = 1
-        for row in rows:
-            # Skip header rows
-            if 'th>' in row or 'header' in row.lower():
-                continue
+        def on_row(row):
+            if layout.get('skip_header') and row.header:
+                return False
+            if layout.get('skip_first_row') and (row.has_th or row.row_index == 0):
+                return False
             
-            # Look for team names - ESPN typically has team names in links or specific classes
-            team_match = re.search(r'<a[^>]*>([^<]*(?:Flamengo|Palmeiras|São Paulo|Corinthians|Grêmio|Internacional|Atlético|Santos|Fluminense|Botafogo|Vasco|Bahia|Cruzeiro|Fortaleza|Ceará|Sport|Vitória|Athletico|Bragantino|Juventude|Mirassol|Cuiabá|Goiás|Coritiba|América)[^<]*)</a>', row, re.IGNORECASE)
+            # Team name comes from the first link (or cell) that names a known team
+            team_name = None
+            for text in (row.links if from_link else row.cells):
+                canonical = self.teams.canonical(text)
+                if canonical:
+                    team_name = self.teams.display(canonical)
+                    break
             
-            if team_match:
-                team_name = team_match.group(1).strip()
-                # Clean up team name
-                team_name = re.sub(r'\s+', ' ', team_name)
-                
-                # Extract points/stats from the row
-                cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.DOTALL | re.IGNORECASE)
-                
-                if len(cells) >= 5:  # Minimum columns expected
-                    # Clean cell content
-                    clean_cells = []
-                    for cell in cells:
-                        clean_text = re.sub(r'<[^>]+>', '', cell).strip()
-                        clean_cells.append(clean_text)
-                    
-                    # Try to find games played (usually 2nd or 3rd column)
-                    games_played = '0'
-                    for i, cell in enumerate(clean_cells[1:4]):  # Check columns 1-3
-                        if cell.isdigit() and 0 <= int(cell) <= 38:  # Valid range for games in Brasileirão
-                            games_played = cell
-                            break
-                    
-                    teams.append({
-                        'position': position,
-                        'team': team_name,
-                        'points': clean_cells[-1] if clean_cells else '0',  # Points usually last column
-                        'games': games_played
-                    })
-                    position += 1
-                    
-                    if position > 20:  # Brasileirão has 20 teams
-                        break
+            if not team_name or len(row.cells) < layout['min_cells']:
+                return False
+            
+            teams.append({
+                'position': len(teams) + 1,
+                'team': team_name,
+                'points': self._pick_number(row.cells, layout['points']),
+                'games': self._pick_number(row.cells, layout['games'])
+            })
+            # Brasileirão has 20 teams
+            return len(teams) >= max_teams
+        
+        with self.metrics.stage('parse'):
+            TableExtractor(on_row, table=layout['table']).extract(html_content)
         
         return teams if teams else None
     
-    def scrape_gazeta_standings(self):
-        """Scrape standings from Gazeta Esportiva"""
-        url = "https://www.gazetaesportiva.com/campeonatos/brasileiro-serie-a/"
-        
-        print("Fetching standings from Gazeta Esportiva...")
-        html_content = self.fetch_url(url)
+    def table_fingerprint(self, html_content, layout):
+        """SHA-256 of the page region that holds the standings table(s)"""
+        begin = html_content.find('<table')
+        if begin < 0:
+            region = html_content
+        else:
+            if layout['table'] == 0:
+                end = html_content.find('</table>', begin)
+            else:
+                end = html_content.rfind('</table>')
+            region = html_content[begin:end + len('</table>')] if end >= 0 else html_content[begin:]
+        return hashlib.sha256(region.encode('utf-8')).hexdigest()
+    
+    def scrape_source(self, source, cancelled=None, known_fingerprints=None):
+        """Fetch and parse one entry of self.sources"""
+        print(f"Fetching standings from {source['name']}...")
+        layout = SOURCE_LAYOUTS[source['layout']]
         
-        if not html_content:
-            return None
+        counted = [0, 0]  # </tr> seen so far, offset the next count starts from
+
+        def table_received(text):
+            # Stop downloading once the part already received holds the whole
+            # table. Only markers are counted here: the rows are parsed once,
+            # below, and not at all when the table turns out to be unchanged
+            if layout['table'] is not None:
+                return text.count('</table>') > layout['table']
+            counted[0] += text.count('</tr>', counted[1])
+            counted[1] = max(0, len(text) - len('</tr>') + 1)
+            return counted[0] > 20  # 20 teams plus a header row
         
-        teams = []
+        html_content = self.fetch_url(source['url'], timeout=source.get('timeout'),
+                                      stop_marker='</table>', stop_when=table_received, cancelled=cancelled)
         
-        # Encontrar a tabela principal
-        table_match = re.search(r'<table[^>]*>.*?</table>', html_content, re.DOTALL)
+        if not html_content or (cancelled is not None and cancelled.is_set()):
+            return None
         
-        if table_match:
-            table = table_match.group(0)
-            
-            # Extrair todas as linhas da tabela
-            rows = re.findall(r'<tr[^>]*>.*?</tr>', table, re.DOTALL)
-            
-            position = 1
-            for i, row in enumerate(rows):
-                # Pular cabeçalho
-                if '<th>' in row or i == 0:
-                    continue
-                
-                # Extrair células
-                cells = re.findall(r'<td[^>]*>(.*?)</td>', row, re.DOTALL)
-                
-                if len(cells) >= 3:  # Pelo menos posição, time, pontos
-                    # Limpar conteúdo das células
-                    clean_cells = []
-                    for cell in cells:
-                        clean_text = re.sub(r'<[^>]+>', '', cell).strip()
-                        clean_text = re.sub(r'\s+', ' ', clean_text)
-                        clean_cells.append(clean_text)
-                    
-                    # Tentar encontrar nome do time
-                    team_name = None
-                    for cell in clean_cells:
-                        # Procurar por nomes conhecidos de times
-                        known_teams = [
-                            'Flamengo', 'Palmeiras', 'Cruzeiro', 'Corinthians', 'São Paulo', 
-                            'Santos', 'Grêmio', 'Internacional', 'Atlético', 'Fluminense', 
-                            'Botafogo', 'Vasco', 'Bahia', 'Fortaleza', 'Ceará', 'Sport', 
-                            'Vitória', 'Bragantino', 'Juventude', 'Mirassol', 'Cuiabá'
-                        ]
-                        
-                        if any(team in cell for team in known_teams):
-                            team_name = cell
-                            break
-                    
-                    # Encontrar pontos (último número válido na linha)
-                    points = '0'
-                    games_played = '0'
-                    
-                    for cell in reversed(clean_cells):
-                        if cell.isdigit():
-                            num = int(cell)
-                            if num <= 114:  # Máximo de pontos possível no Brasileirão
-                                points = cell
-                                break
-                    
-                    # Tentar encontrar jogos (número entre 0-38)
-                    for cell in clean_cells:
-                        if cell.isdigit():
-                            num = int(cell)
-                            if 0 <= num <= 38:  # Número válido de jogos
-                                games_played = cell
-                                break
-                    
-                    if team_name:
-                        # Normalizar nome do time para compatibilidade
-                        if 'Atlético' in team_name:
-                            team_name = 'Atlético-MG'
-                        elif 'Bragantino' in team_name:
-                            team_name = 'Red Bull Bragantino'
-                        elif 'Paulo' in team_name:
-                            team_name = 'São Paulo'
-                        else:
-                            # Pegar apenas o nome principal do time
-                            team_name = team_name.split()[-1] if len(team_name.split()) > 1 else team_name
-                        
-                        teams.append({
-                            'position': position,
-                            'team': team_name,
-                            'points': points,
-                            'games': games_played
-                        })
-                        
-                        position += 1
-                        
-                        if position > 20:
-                            break
+        fingerprint = self.table_fingerprint(html_content, layout)
+        self.fingerprints[source['name']] = fingerprint
+        if known_fingerprints and known_fingerprints.get(source['name']) == fingerprint:
+            # Same table as the last update: no need to parse it again
+            return STANDINGS_UNCHANGED
         
-        return teams if teams else None
+        standings = self.parse_standings(html_content, layout)
+        self.metrics.count('rows_parsed', len(standings or []))
+        return standings
     
-    def get_current_standings(self):
-        """Get current standings by scraping from online sources"""
+    def get_current_standings(self, known_fingerprints=None):
+        """Get current standings by scraping from online sources
+
+        When known_fingerprints (source name -> table digest) is given and the
+        winning source's table matches, STANDINGS_UNCHANGED is returned instead.
+        """
         print("Scraping current Brazilian Championship 2025 standings...")
         
-        # Try multiple sources in order of reliability
-        sources = [
-            ("ESPN Brazil", self.scrape_espn_standings),
-            ("Gazeta Esportiva", self.scrape_gazeta_standings),
-        ]
+        # Fetch every source at once; the first one that passes validation wins
+        cancelled = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=len(self.sources), thread_name_prefix="standings")
+        pending = {executor.submit(self.scrape_source, source, cancelled, known_fingerprints): source
+                   for source in self.sources}
+        deadline = time.monotonic() + self.fetch_deadline
         
-        for source_name, scraper_func in sources:
-            try:
-                standings = scraper_func()
-                if standings and len(standings) >= 15:  # At least 15 teams found
-                    print(f"✅ Successfully scraped {len(standings)} teams from {source_name}")
-                    return standings
-                else:
-                    print(f"❌ {source_name}: Insufficient data ({len(standings) if standings else 0} teams)")
-            except Exception as e:
-                print(f"❌ {source_name}: Error - {e}")
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    names = ", ".join(source['name'] for source in pending.values())
+                    print(f"⏱️ Deadline of {self.fetch_deadline}s reached waiting for: {names}")
+                    break
+                
+                done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source_name = pending.pop(future)['name']
+                    try:
+                        standings = future.result()
+                        if standings is STANDINGS_UNCHANGED:
+                            print(f"✅ {source_name}: standings table unchanged since last update")
+                            self.standings_source = source_name
+                            return standings
+                        if standings and len(standings) >= 15:  # At least 15 teams found
+                            print(f"✅ Successfully scraped {len(standings)} teams from {source_name}")
+                            self.standings_source = source_name
+                            return standings
+                        else:
+                            print(f"❌ {source_name}: Insufficient data ({len(standings) if standings else 0} teams)")
+                    except Exception as e:
+                        print(f"❌ {source_name}: Error - {e}")
+        finally:
+            # Drop the slower sources: queued ones never start, running ones have
+            # their connections shut so that no download outlives this call
+            cancelled.set()
+            self.http.abort(cancelled)
+            executor.shutdown(wait=False, cancel_futures=True)
         
         # No fallback - if scraping fails, return None
         print("❌ All scraping sources failed")
@@ -247,92 +2488,137 @@ class BrasileiroScraper:
         # Clean up the team name
         team_name = team_name.strip()
         
-        # Handle common variations
-        name_mappings = {
-            'Red Bull Bragantino': 'Bragantino',
-            'RB Bragantino': 'Bragantino',
-            'Vasco da Gama': 'Vasco',
-            'Atlético-MG': 'Atlético-MG',
-            'Atlético Mineiro': 'Atlético-MG',
-            'Athletico-PR': 'Athletico-PR',
-            'Athletico Paranaense': 'Athletico-PR',
-            'Red Bull Salzburg': 'Bragantino',  # Just in case
-        }
-        
-        # Check direct mappings
-        if team_name in name_mappings:
-            return name_mappings[team_name]
-        
-        # Check if any mapping key contains the team name or vice versa
-        for key, value in name_mappings.items():
-            if key.lower() in team_name.lower() or team_name.lower() in key.lower():
-                return value
-        
-        return team_name
+        # Unknown names are kept as they are
+        return self.teams.canonical(team_name) or team_name
     
     def calculate_score(self, predicted_pos, actual_pos):
         """Calculate score: 20 points minus absolute deviation"""
         deviation = abs(predicted_pos - actual_pos)
         score = max(0, 20 - deviation)  # Minimum score is 0
         return score
+
+    def normalize_score(self, raw_score):
+        """Normalize a raw total (200-400) to the 0-100 scale"""
+        return max(0, min(100, round((raw_score - 200) / 2)))
+
+    def get_score_engine(self, predictions):
+        """Compile predictions into a ScoreEngine, reusing it while predictions are unchanged"""
+        if self._score_engine is None or self._score_engine_source is not predictions:
+            index = predictions
+            if not isinstance(index, PredictionIndex):
+                index = PredictionIndex(predictions, self.normalize_team_name)
+            self._score_engine = ScoreEngine(index, self.calculate_score, self.normalize_score)
+            self._score_engine_source = predictions
+        return self._score_engine
     
+    def build_results(self, actual_standings, predictions):
+        """Score the predictions once into the ResultsModel every output is rendered from
+
+        Totals are updated from the last run's (score_cache.json) for the teams
+        that moved; with verify_scores a full recompute double-checks them.
+        """
+        engine = self.get_score_engine(predictions)
+        if not engine.has_state():
+            engine.restore(self.load_score_cache())
+        sheet = engine.evaluate(actual_standings, self.normalize_team_name)
+        if sheet.moved_teams is not None:
+            self.metrics.count('teams_rescored', len(sheet.moved_teams))
+            if self.verify_scores:
+                full_sheet = engine.evaluate(actual_standings, self.normalize_team_name, incremental=False)
+                if full_sheet.raw_scores == sheet.raw_scores:
+                    print(f"✅ Incremental scores ({len(sheet.moved_teams)} teams moved) match a full recompute")
+                else:
+                    mismatches = sum(1 for player in sheet.players
+                                     if full_sheet.raw_scores[player] != sheet.raw_scores[player])
+                    print(f"⚠️ Incremental scores differ from a full recompute for {mismatches} players - using the full recompute")
+                    sheet = full_sheet
+
+        def outcomes():
+            # Only the README ranking, JSON output and API need these: skip them for console-only runs
+            with self.metrics.stage('outcomes'):
+                return self.season_outcomes(actual_standings, sheet, engine)
+        return ResultsModel(actual_standings, sheet, self.get_current_round(actual_standings), outcomes=outcomes)
+
+    @staticmethod
+    def standings_digest(standings):
+        """SHA-256 of what the outcomes depend on: position, team, points and games of every row"""
+        rows = [[team_data.get(key) for key in ('position', 'team', 'points', 'games')] for team_data in standings]
+        return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def season_outcomes(self, actual_standings, sheet, engine):
+        """Best/worst final score still reachable by each player (OutcomeBounds)
+
+        Kept per pool with the digest of the standings they were computed
+        from, so polls of an unchanged table do not solve them again.
+        """
+        digest = self.standings_digest(actual_standings)
+        cached = self._outcomes_cache.get(engine.digest)
+        if cached is not None and cached[0] == digest:
+            return cached[1]
+        # Predictions may name more teams than a short scraped table holds: the
+        # season length and the deviations come from the larger of the two
+        teams = max(len(actual_standings), engine.max_position)
+        lookup = engine._lookup(teams)
+        outcomes = SeasonOutcomes(actual_standings, total_rounds=2 * (teams - 1))
+        best, worst = outcomes.player_bounds(sheet.predicted, sheet.players, lookup)
+        bounds = OutcomeBounds(best, worst, self.normalize_score)
+        self._outcomes_cache[engine.digest] = (digest, bounds)
+        return bounds
+
+    def save_score_cache(self, predictions, filename=None):
+        """Save the positions and player totals of the last scoring, the base of the next incremental one"""
+        filename = filename or self.output_path("score_cache.json")
+        snapshot = self.get_score_engine(predictions).snapshot()
+        if snapshot is None:
+            return
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"❌ Error saving score cache: {e}")
+
+    def load_score_cache(self, filename=None):
+        """Load the snapshot written by save_score_cache (None if missing or unreadable)"""
+        filename = filename or self.output_path("score_cache.json")
+        try:
+            if os.path.exists(filename):
+                with open(filename, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"❌ Error loading score cache: {e}")
+        return None
+
     def compare_predictions(self, actual_standings, predictions):
         """Compare predictions with actual standings and calculate scores"""
         if not predictions or not actual_standings:
             return
         
-        # Calculate scores for each player
-        player_scores = {}
-        raw_scores = {}
-        
-        print(f"\n🏆 BRASILEIRÃO 2025 - BOLÃO RESULTS")
-        print(f"Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 120)
-        
-        # Header
-        print(f"{'Team':<20} {'Actual':<8}", end="")
-        for player in predictions.keys():
-            print(f"{player:<12}", end="")
-        print()
-        print("-" * 120)
-        
-        # Process each team
-        for team_data in actual_standings:
-            original_team_name = team_data['team']
-            team_name = self.normalize_team_name(original_team_name)
-            actual_pos = team_data['position']
-            
-            print(f"{original_team_name:<20} {actual_pos:<8}", end="")
-            
-            for player, player_predictions in predictions.items():
-                if player not in raw_scores:
-                    raw_scores[player] = 0
-                # Find predicted position for this team
-                predicted_pos = None
-                for pos, predicted_team in player_predictions.items():
-                    if predicted_team == team_name:
-                        predicted_pos = int(pos)
-                        break
-                if predicted_pos is not None:
-                    score = self.calculate_score(predicted_pos, actual_pos)
-                    raw_scores[player] += score
-                    print(f"{predicted_pos}°({score}p) ", end="")
-                else:
-                    print("--       ", end="")
-            
-            print()
-        
-        # Display final scores
-        print("-" * 120)
-        print(f"{'FINAL SCORES:':<20} {'':>8}", end="")
-        player_scores = {}
-        for player in predictions.keys():
-            norm_score = max(0, min(100, round((raw_scores.get(player, 0) - 200) / 2)))
-            player_scores[player] = norm_score
-            print(f"{norm_score:<12}", end="")
-        print()
+        results = self.build_results(actual_standings, predictions)
+        print(render_console(results))
         # Retorna também os scores brutos para uso na tabela do README
-        return player_scores, raw_scores
+        return results.normalized_scores, results.raw_scores
+
+    def notify_listeners(self, results):
+        if self.result_listeners:
+            # Listeners serve the results from their own threads (the API event
+            # loop): compute the lazy outcomes here, never on a reader's request
+            results.outcomes
+        for listener in self.result_listeners:
+            try:
+                listener(self, results)
+            except Exception as e:
+                print(f"❌ Error in results listener: {e}")
+
+    def write_result_files(self, results):
+        """Write every format of self.outputs (results.json, results.csv) next to README.md"""
+        for output in self.outputs:
+            filename = self.output_path(RESULT_FILES[output])
+            try:
+                with open(filename, 'w', encoding='utf-8', newline='') as f:
+                    f.write(RESULT_RENDERERS[output](results))
+                print(f"✅ Results written to {filename}")
+            except Exception as e:
+                print(f"❌ Error writing {filename}: {e}")
     
 
     def get_current_round(self, standings):
@@ -363,14 +2649,8 @@ class BrasileiroScraper:
 
     def save_score_history(self, normalized_scores, raw_scores, current_round, force_update=False):
         """Save current scores to history for graph generation"""
-        history_file = "score_history.json"
-        
         try:
-            # Load existing history
-            history = []
-            if os.path.exists(history_file):
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    history = json.load(f)
+            store = self.history_store
             
             # Create new entry
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -383,34 +2663,28 @@ class BrasileiroScraper:
             
             # Check if scores have changed from last entry
             scores_changed = True
-            should_add_to_history = True
+            last_entry = store.last_entry()
             
-            if history and len(history) > 0:
-                last_entry = history[-1]
-                
+            if last_entry is not None:
                 # Check if normalized scores are the same
                 if last_entry.get('normalized_scores') == normalized_scores:
                     scores_changed = False
                     
-                    # If force_update, update the timestamp of the last entry instead of adding new
+                    # If force_update, re-append the last entry with a fresh timestamp
+                    # (the log is append-only; the per-round index picks up the newest one)
                     if force_update:
                         print("📊 Scores unchanged but force updating - refreshing timestamp")
-                        history[-1]['timestamp'] = timestamp
-                        should_add_to_history = False
+                        refreshed_entry = dict(last_entry)
+                        refreshed_entry['timestamp'] = timestamp
+                        store.append(refreshed_entry)
                     else:
                         print("📊 Scores unchanged - not adding to history")
-                        should_add_to_history = False
             
             # Add new entry only if scores actually changed
-            if should_add_to_history and scores_changed:
-                history.append(new_entry)
+            if scores_changed:
+                store.append(new_entry)
                 print(f"📈 Score history updated: Rodada {current_round} - {timestamp}")
             
-            # Save updated history (either new entry or updated timestamp)
-            if should_add_to_history or (force_update and not scores_changed):
-                with open(history_file, 'w', encoding='utf-8') as f:
-                    json.dump(history, f, indent=2, ensure_ascii=False)
-            
             # Always return True if we need to update graph (either scores changed or force update)
             return scores_changed or force_update
             
@@ -419,7 +2693,11 @@ class BrasileiroScraper:
             return False
 
     def filter_unique_rounds(self, history):
-        """Filter history to keep only the latest entry for each round"""
+        """Filter history to keep only the latest entry for each round
+
+        Reference for ScoreHistoryStore.latest_per_round, which answers the same
+        question from its index.
+        """
         if not history:
             return []
         
@@ -440,137 +2718,138 @@ class BrasileiroScraper:
         
         return filtered_history
 
-    def generate_score_graph(self):
-        """Generate visual score graph for README"""
-        history_file = "score_history.json"
-        
-        if not os.path.exists(history_file):
-            return ["", "### 📈 Histórico de Desempenho", "", "*Nenhum histórico disponível ainda.*", ""]
-        
+    def history_players(self, history):
+        """Players of the latest history entry, highest current score first"""
+        latest_scores = history[-1]['normalized_scores']
+        return sorted(latest_scores, key=latest_scores.get, reverse=True)
+
+    def generate_score_graph(self, render_chart=True):
+        """Generate visual score graph for README
+
+        With render_chart=False the existing chart image is reused as is.
+        """
         try:
-            with open(history_file, 'r', encoding='utf-8') as f:
-                full_history = json.load(f)
-            
-            if not full_history:
-                return ["", "### 📈 Histórico de Desempenho", "", "*Nenhum histórico disponível ainda.*", ""]
-            
-            # Filter to get only the latest entry for each round
-            history = self.filter_unique_rounds(full_history)
-            
-            # Get player names from latest entry and sort by current score (descending)
-            latest_entry = history[-1]
-            players_scores = [(player, score) for player, score in latest_entry['normalized_scores'].items()]
-            players_scores.sort(key=lambda x: x[1], reverse=True)  # Sort by score descending
-            players = [player for player, score in players_scores]
-            
-            graph_lines = []
-            graph_lines.append("")
-            graph_lines.append("### 📈 Histórico de Desempenho")
-            graph_lines.append("")
-            
+            # Only the latest entry for each round
+            history = self.history_store.latest_per_round()
+            if not history:
+                return self.score_graph_lines(history, [], chart_link=False)
+            players = self.history_players(history)
+
             # Generate visual chart if matplotlib is available
-            if MATPLOTLIB_AVAILABLE and len(history) >= 1:
+            chart_link = False
+            if MATPLOTLIB_AVAILABLE:
                 try:
-                    self.create_performance_chart(history, players)
-                    graph_lines.append("![Gráfico de Performance](performance_chart.png)")
-                    graph_lines.append("")
+                    if render_chart or not os.path.exists(self.chart_path):
+                        self.create_performance_chart(history, players)
+                    chart_link = True
                 except Exception as e:
                     print(f"⚠️ Warning: Could not generate chart: {e}")
-            
-            # Create a simple ASCII table showing score progression
-            if len(history) >= 1:
-                # Table header with players ordered by current score
-                header = "| Rodada | " + " | ".join([f"{player}" for player in players]) + " |"
-                separator = "|" + "|".join(["-------"] * (len(players) + 1)) + "|"
-                
-                graph_lines.append(header)
-                graph_lines.append(separator)
-                
-                # Show last 10 unique rounds to keep table manageable
-                recent_history = history[-10:]
-                
-                for entry in recent_history:
-                    round_num = entry.get('round', 'N/A')
-                    
-                    row = f"| R{round_num} |"
-                    for player in players:  # Use ordered players
-                        score = entry['normalized_scores'].get(player, 0)
-                        row += f" {score} |"
-                    
-                    graph_lines.append(row)
-                
-                # Add trend indicators
-                graph_lines.append("")
-                graph_lines.append("**Tendência (últimas 2 medições):**")
-                
-                if len(history) >= 2:
-                    current = history[-1]['normalized_scores']
-                    previous = history[-2]['normalized_scores']
-                    
-                    trends = []
-                    for player in players:  # Use ordered players
-                        current_score = current.get(player, 0)
-                        previous_score = previous.get(player, 0)
-                        diff = current_score - previous_score
-                        
-                        if diff > 0:
-                            trend = f"📈 +{diff}"
-                        elif diff < 0:
-                            trend = f"📉 {diff}"
-                        else:
-                            trend = "➡️ =0"
-                        
-                        trends.append(f"**{player}**: {trend}")
-                    
-                    graph_lines.extend([f"- {trend}" for trend in trends])
-                
-            else:
-                graph_lines.append("*Aguardando mais dados para mostrar histórico...*")
-            
-            graph_lines.append("")
-            
-            return graph_lines
-            
+            return self.score_graph_lines(history, players, chart_link)
+
         except Exception as e:
             print(f"❌ Error generating score graph: {e}")
             return ["", "### 📈 Histórico de Desempenho", "", f"*Erro ao gerar gráfico: {e}*", ""]
 
-    def create_performance_chart(self, history, players):
-        """Create a visual performance chart using matplotlib"""
-        if not MATPLOTLIB_AVAILABLE:
-            return
-        
+    def score_graph_lines(self, history, players, chart_link):
+        """README history section: chart link, last 10 rounds and trends (no rendering here)"""
+        if not history:
+            return ["", "### 📈 Histórico de Desempenho", "", "*Nenhum histórico disponível ainda.*", ""]
+
+        graph_lines = []
+        graph_lines.append("")
+        graph_lines.append("### 📈 Histórico de Desempenho")
+        graph_lines.append("")
+
+        if chart_link:
+            graph_lines.append(f"![Gráfico de Performance]({os.path.basename(self.chart_path)})")
+            graph_lines.append("")
+
+        # Table header with players ordered by current score
+        header = "| Rodada | " + " | ".join([f"{player}" for player in players]) + " |"
+        separator = "|" + "|".join(["-------"] * (len(players) + 1)) + "|"
+
+        graph_lines.append(header)
+        graph_lines.append(separator)
+
+        # Show last 10 unique rounds to keep table manageable
+        recent_history = history[-10:]
+
+        for entry in recent_history:
+            round_num = entry.get('round', 'N/A')
+
+            row = f"| R{round_num} |"
+            for player in players:  # Use ordered players
+                score = entry['normalized_scores'].get(player, 0)
+                row += f" {score} |"
+
+            graph_lines.append(row)
+
+        # Add trend indicators
+        graph_lines.append("")
+        graph_lines.append("**Tendência (últimas 2 medições):**")
+
+        if len(history) >= 2:
+            current = history[-1]['normalized_scores']
+            previous = history[-2]['normalized_scores']
+
+            trends = []
+            for player in players:  # Use ordered players
+                current_score = current.get(player, 0)
+                previous_score = previous.get(player, 0)
+                diff = current_score - previous_score
+
+                if diff > 0:
+                    trend = f"📈 +{diff}"
+                elif diff < 0:
+                    trend = f"📉 {diff}"
+                else:
+                    trend = "➡️ =0"
+
+                trends.append(f"**{player}**: {trend}")
+
+            graph_lines.extend([f"- {trend}" for trend in trends])
+
+        graph_lines.append("")
+
+        return graph_lines
+
+    def chart_digest(self, history, players):
+        """Content address of a chart: everything that ends up drawn on it"""
+        payload = {
+            'players': players,
+            'points': [[entry.get('round'), [entry['normalized_scores'].get(player, 0) for player in players]]
+                       for entry in history],
+            'svg': self.chart_svg,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+    
+    def _chart_digest_file(self):
+        return os.path.splitext(self.chart_path)[0] + ".digest"
+    
+    def _build_chart_template(self, players, single_point):
+        """Create the figure, axes, styling and one artist per player"""
         # Configure matplotlib for better appearance
-        plt.style.use('default')
-        fig, ax = plt.subplots(figsize=(12, 8))
+        matplotlib.style.use('default')
+        fig = Figure(figsize=(12, 8))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
         
         # Colors for each player
         colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD']
         
-        # Prepare data - use rounds instead of timestamps
-        rounds = []
-        for entry in history:
-            # Get round from entry, or estimate from position if not available
-            round_num = entry.get('round', len(rounds) + 1)
-            rounds.append(round_num)
-        
-        # Plot lines for each player
+        artists = []
         for i, player in enumerate(players):
-            scores = []
-            for entry in history:
-                scores.append(entry['normalized_scores'].get(player, 0))
-            
             color = colors[i % len(colors)]
-            
-            if len(rounds) == 1:
+            if single_point:
                 # Single point - show as dot with larger marker
-                ax.scatter(rounds, scores, s=150, color=color, label=player, 
-                          edgecolors='white', linewidth=2, zorder=5)
+                artists.append(ax.scatter([], [], s=150, color=color, label=player,
+                                          edgecolors='white', linewidth=2, zorder=5))
             else:
                 # Multiple points - show as line with markers
-                ax.plot(rounds, scores, marker='o', linewidth=2.5, markersize=8, 
-                       label=player, color=color, markerfacecolor='white', 
-                       markeredgecolor=color, markeredgewidth=2)
+                line, = ax.plot([], [], marker='o', linewidth=2.5, markersize=8,
+                                label=player, color=color, markerfacecolor='white',
+                                markeredgecolor=color, markeredgewidth=2)
+                artists.append(line)
         
         # Customize the chart
         ax.set_title('Evolução do Desempenho - Bolão Brasileirão 2025', 
@@ -581,8 +2860,67 @@ class BrasileiroScraper:
         # Set y-axis limits
         ax.set_ylim(0, 100)
         
+        # Add grid
+        ax.grid(True, alpha=0.3, linestyle='--')
+        
+        # Add legend
+        ax.legend(loc='upper left', frameon=True, fancybox=True, shadow=True)
+        
+        return {
+            'figure': fig,
+            'axes': ax,
+            'players': list(players),
+            'single_point': single_point,
+            'colors': colors,
+            'artists': artists,
+            'annotations': [],
+        }
+    
+    def create_performance_chart(self, history, players):
+        """Create a visual performance chart using matplotlib"""
+        if not MATPLOTLIB_AVAILABLE:
+            return
+        
+        chart_path = self.chart_path
+        digest_file = self._chart_digest_file()
+        digest = self.chart_digest(history, players)
+        try:
+            if os.path.exists(chart_path) and os.path.exists(digest_file):
+                with open(digest_file, 'r', encoding='utf-8') as f:
+                    if f.read().strip() == digest:
+                        print("📊 Performance chart unchanged - skipping render")
+                        return chart_path
+        except OSError:
+            pass
+        
+        if not load_matplotlib():
+            return
+        
+        # Prepare data - use rounds instead of timestamps
+        rounds = []
+        for entry in history:
+            # Get round from entry, or estimate from position if not available
+            round_num = entry.get('round', len(rounds) + 1)
+            rounds.append(round_num)
+        
+        # Reuse the figure from the last render when the layout still fits
+        single_point = len(rounds) == 1
+        chart = self._chart
+        if chart is None or chart['players'] != list(players) or chart['single_point'] != single_point:
+            chart = self._chart = self._build_chart_template(players, single_point)
+        fig = chart['figure']
+        ax = chart['axes']
+        
+        # Update each player's data in place
+        for player, artist in zip(players, chart['artists']):
+            scores = [entry['normalized_scores'].get(player, 0) for entry in history]
+            if single_point:
+                artist.set_offsets(list(zip(rounds, scores)))
+            else:
+                artist.set_data(rounds, scores)
+        
         # Format x-axis for rounds
-        if len(rounds) == 1:
+        if single_point:
             # Single point - show with padding
             ax.set_xlim(rounds[0] - 1, rounds[0] + 1)
             ax.set_xticks([rounds[0]])
@@ -593,171 +2931,199 @@ class BrasileiroScraper:
             ax.set_xticks(rounds)
             ax.set_xticklabels([f'R{r}' for r in rounds])
         
-        # Add grid
-        ax.grid(True, alpha=0.3, linestyle='--')
-        
-        # Add legend
-        ax.legend(loc='upper left', frameon=True, fancybox=True, shadow=True)
-        
         # Highlight the latest scores
-        if len(history) > 0:
-            latest_entry = history[-1]
-            latest_round = rounds[-1]
-            for i, player in enumerate(players):
-                latest_score = latest_entry['normalized_scores'].get(player, 0)
-                color = colors[i % len(colors)]
-                ax.annotate(f'{latest_score}', 
-                           xy=(latest_round, latest_score),
-                           xytext=(10, 10), textcoords='offset points',
-                           bbox=dict(boxstyle='round,pad=0.3', fc=color, alpha=0.7),
-                           fontweight='bold', fontsize=10, color='white')
+        for annotation in chart['annotations']:
+            annotation.remove()
+        chart['annotations'] = []
+        latest_entry = history[-1]
+        latest_round = rounds[-1]
+        for i, player in enumerate(players):
+            latest_score = latest_entry['normalized_scores'].get(player, 0)
+            color = chart['colors'][i % len(chart['colors'])]
+            chart['annotations'].append(ax.annotate(f'{latest_score}', 
+                       xy=(latest_round, latest_score),
+                       xytext=(10, 10), textcoords='offset points',
+                       bbox=dict(boxstyle='round,pad=0.3', fc=color, alpha=0.7),
+                       fontweight='bold', fontsize=10, color='white'))
         
         # Improve layout
-        plt.tight_layout()
+        fig.tight_layout()
         
         # Save the chart
-        chart_path = "performance_chart.png"
-        plt.savefig(chart_path, dpi=150, bbox_inches='tight', 
+        fig.savefig(chart_path, dpi=150, bbox_inches='tight', 
                    facecolor='white', edgecolor='none')
-        plt.close()
+        if self.chart_svg:
+            # Text kept as text (no glyph paths) and no timestamp, so the SVG stays small and diffable
+            svg_path = os.path.splitext(chart_path)[0] + ".svg"
+            with matplotlib.rc_context({'svg.fonttype': 'none', 'svg.hashsalt': 'bolao'}):
+                fig.savefig(svg_path, format='svg', bbox_inches='tight',
+                           facecolor='white', edgecolor='none', metadata={'Date': None})
+        
+        with open(digest_file, 'w', encoding='utf-8') as f:
+            f.write(digest)
         
         print(f"📊 Gráfico de performance salvo em: {chart_path}")
         
         return chart_path
 
-    def update_readme(self, actual_standings, predictions, raw_scores, force_update=False):
-        """Update README.md with the latest results"""
-        try:
-            # Sort players by score (highest first)
-            sorted_players = sorted(raw_scores.items(), key=lambda x: x[1], reverse=True)
-            player_names = [player[0] for player in sorted_players]
-
-            # Calculate normalized scores for graph
-            normalized_scores = {}
-            for player, score in raw_scores.items():
-                normalized_scores[player] = max(0, min(100, round((score - 200) / 2)))
-
-            # Generate the results table
-            results_table = []
-            results_table.append("## 🏆 Resultados Atuais")
-            results_table.append("")
-            results_table.append(f"**Última Atualização:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            results_table.append("")
-
-            # Create table header with players sorted by score
-            header = "| Time | Real |"
-            for player in player_names:
-                header += f" {player} |"
-            results_table.append(header)
-
-            # Create separator
-            separator = "|------|------|"
-            for _ in player_names:
-                separator += "------|"
-            results_table.append(separator)
-
-            # Create rows for each team
-            for team_data in actual_standings:
-                original_team_name = team_data['team']
-                team_name = self.normalize_team_name(original_team_name)
-                actual_pos = team_data['position']
-
-                row = f"| {original_team_name} | {actual_pos} |"
-
-                for player in player_names:
-                    player_predictions = predictions[player]
-                    # Find predicted position for this team
-                    predicted_pos = None
-                    for pos, predicted_team in player_predictions.items():
-                        if predicted_team == team_name:
-                            predicted_pos = int(pos)
-                            break
-
-                    if predicted_pos is not None:
-                        score = self.calculate_score(predicted_pos, actual_pos)
-                        row += f" {predicted_pos}°({score}p) |"
-                    else:
-                        row += " -- |"
+    def create_player_charts(self, history, players):
+        """One small score-evolution chart per player in charts/<player>.png, next to the pool average
 
-                results_table.append(row)
+        Like the main chart, each image is only redrawn when what it shows
+        changes (charts/digests.json keeps the digest of every image).
+        """
+        if not load_matplotlib():
+            return []
+        os.makedirs(self.player_charts_dir, exist_ok=True)
+        digest_file = os.path.join(self.player_charts_dir, "digests.json")
+        try:
+            with open(digest_file, 'r', encoding='utf-8') as f:
+                digests = json.load(f)
+        except (OSError, ValueError):
+            digests = {}
 
-            # Add total scores row (pontuação bruta)
-            total_row = "| **TOTAL** | |"
-            for player in player_names:
-                total_row += f" **{raw_scores.get(player, 0)}** |"
-            results_table.append(total_row)
-            
-            # Add ranking (pontuação normalizada)
-            results_table.append("")
-            results_table.append("### 🏅 Classificação Final (pontuação normalizada 0-100)")
-            results_table.append("")
-            for i, (player, score) in enumerate(sorted_players, 1):
-                norm_score = max(0, min(100, round((score - 200) / 2)))
-                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-                results_table.append(f"{medal} **{player}**: {norm_score} pontos")
-
-            # Calculate current round first
-            current_round = self.get_current_round(actual_standings)
-            
+        rounds = [entry.get('round', i) for i, entry in enumerate(history, 1)]
+        average = [sum(entry['normalized_scores'].values()) / max(1, len(entry['normalized_scores']))
+                   for entry in history]
+        written = []
+        for player in players:
+            scores = [entry['normalized_scores'].get(player, 0) for entry in history]
+            chart_path = os.path.join(self.player_charts_dir, slugify(player) + ".png")
+            digest = hashlib.sha256(json.dumps([player, rounds, scores, average]).encode('utf-8')).hexdigest()
+            if digests.get(player) == digest and os.path.exists(chart_path):
+                continue
+
+            fig = Figure(figsize=(6, 3))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot(111)
+            ax.plot(rounds, average, linestyle='--', color='#999999', linewidth=1.5, label='Média do bolão')
+            ax.plot(rounds, scores, marker='o', color='#45B7D1', linewidth=2.5, label=player)
+            ax.set_title(player, fontsize=12, fontweight='bold')
+            ax.set_xlabel('Rodada')
+            ax.set_ylim(0, 100)
+            ax.grid(True, alpha=0.3, linestyle='--')
+            ax.legend(loc='upper left', fontsize=8)
+            fig.tight_layout()
+            fig.savefig(chart_path, dpi=100, facecolor='white', edgecolor='none')
+            digests[player] = digest
+            written.append(chart_path)
+
+        with open(digest_file, 'w', encoding='utf-8') as f:
+            json.dump(digests, f, ensure_ascii=False, indent=2)
+        if written:
+            print(f"📊 {len(written)} player charts saved in {self.player_charts_dir}")
+        return written
+
+    def update_readme(self, results, force_update=False):
+        """Update README.md and the other artifacts of a run (a ResultsModel)
+
+        The score history is saved first; the performance chart, per-player
+        charts and result files then run as independent tasks on a thread
+        pool while the README block is written from this thread, so the README
+        never waits for matplotlib. Every task is joined before returning and
+        what the tasks print is shown afterwards, task by task. A task that
+        fails only loses its own artifact; if the chart fails and no earlier
+        image exists, the README drops its link to it.
+        """
+        try:
             # Save score history and check if we need to regenerate graph
-            should_update_graph = self.save_score_history(normalized_scores, raw_scores, current_round, force_update)
-            
-            # Generate score graph (always regenerate if scores changed or force update)
-            if should_update_graph:
-                print("📊 Generating updated performance chart...")
-            graph_lines = self.generate_score_graph()
-            results_table.extend(graph_lines)
-
-            # Read current README
-            readme_path = "README.md"
-            if os.path.exists(readme_path):
-                with open(readme_path, 'r', encoding='utf-8') as f:
-                    readme_content = f.read()
-
-                # Find and replace the results section
-                results_section = "\n".join(results_table)
-
-                # Check if results section exists
-                import re
-                pattern = r'(## 🏆 Resultados Atuais.*?)(?=\n## |\Z)'
-                if re.search(pattern, readme_content, flags=re.DOTALL):
-                    # Replace existing results section - match everything from results until next ## or end
-                    new_content = re.sub(pattern, results_section, readme_content, flags=re.DOTALL)
-                else:
-                    # Add results section at the beginning after the title
-                    lines = readme_content.split('\n')
-                    title_line = 0
-                    for i, line in enumerate(lines):
-                        if line.startswith('# '):
-                            title_line = i
-                            break
-                    # Insert results after title
-                    lines.insert(title_line + 1, '')
-                    lines.insert(title_line + 2, results_section)
-                    new_content = '\n'.join(lines)
-
-                # Write back to README
-                with open(readme_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+            with self.metrics.stage('history'):
+                should_update_graph = self.save_score_history(results.normalized_scores, results.raw_scores,
+                                                              results.round, force_update)
+                history = self.history_store.latest_per_round()
+            players = self.history_players(history) if history else []
 
-                print(f"✅ Updated README.md with latest results")
+            charts = MATPLOTLIB_AVAILABLE and bool(history)
+            render_chart = charts and (should_update_graph or not os.path.exists(self.chart_path))
+            background = render_chart or (charts and self.player_charts) or bool(self.outputs)
+            # No pool (and no thread start-up) when the README is the only artifact
+            executor = ThreadPoolExecutor(max_workers=self.artifact_workers, thread_name_prefix="artifacts") \
+                if background else None
+            output = ThreadOutput(sys.stdout)
+            tasks = {}
+            buffers = {}
 
-            else:
-                print("❌ README.md not found")
+            def submit(name, after, stage, build, *args):
+                buffers[name] = io.StringIO()
+                tasks[name] = executor.submit(self._background, after, output, buffers[name], stage, build, *args)
+
+            # Workers print into their buffers: the pool is joined before the redirect ends
+            with contextlib.redirect_stdout(output):
+                try:
+                    # Chart only re-rendered if scores changed or force update
+                    if should_update_graph:
+                        print("📊 Generating updated performance chart...")
+                    # matplotlib is not thread-safe: all charts are drawn by a single task
+                    if render_chart:
+                        submit('chart', None, 'chart', self.create_performance_chart, history, players)
+                    if charts and self.player_charts:
+                        submit('player charts', tasks.get('chart'), 'player_charts',
+                               self.create_player_charts, history, players)
+                    # The README and the result files both read the lazy outcomes:
+                    # compute them here, once, before a second thread can ask
+                    results.outcomes
+                    if self.outputs:
+                        submit('result files', None, 'exports', self.write_result_files, results)
+
+                    self._artifact('readme', self.write_readme_block, results, history, players, charts)
+                finally:
+                    if executor is not None:
+                        executor.shutdown(wait=True)
+
+            for name, task in tasks.items():
+                print(buffers[name].getvalue(), end='')
+                error = task.exception()
+                if error is not None:
+                    print(f"⚠️ Warning: Could not generate {name}: {error}")
+            if 'chart' in tasks and tasks['chart'].exception() is not None and not os.path.exists(self.chart_path):
+                self._artifact('readme', self.write_readme_block, results, history, players, False)
 
         except Exception as e:
             print(f"❌ Error updating README: {e}")
-    
-    def save_last_standings(self, standings, filename="last_standings.json"):
+
+    def _artifact(self, stage, build, *args):
+        with self.metrics.stage(stage):
+            return build(*args)
+
+    def _background(self, after, output, buffer, stage, build, *args):
+        """Pool task: once `after` (a Future, or None) is done, whatever its
+        outcome, build the artifact with its output held in buffer"""
+        if after is not None:
+            wait([after])
+        with output.capture(buffer):
+            return self._artifact(stage, build, *args)
+
+    def write_readme_block(self, results, history, players, chart_link):
+        """Rewrite the README results block: results table, ranking and history section"""
+        results_table = [render_markdown(results)]
+        results_table.extend(self.score_graph_lines(history, players, chart_link))
+
+        readme_path = self.output_path("README.md")
+        if not os.path.exists(readme_path):
+            print("❌ README.md not found")
+            return False
+        # Only the block between the results markers is rewritten
+        # The update time alone does not count as a change
+        section = MarkedSection(readme_path, RESULTS_BEGIN, RESULTS_END, legacy_heading="## 🏆 Resultados Atuais",
+                                volatile_prefix=UPDATED_LABEL)
+        if section.write("\n".join(results_table)):
+            print(f"✅ Updated README.md with latest results")
+            return True
+        print("ℹ️  README.md results already up to date - file not rewritten")
+        return False
+
+    def save_last_standings(self, standings, filename=None):
         """Save current standings to a file for comparison"""
+        filename = filename or self.output_path("last_standings.json")
         try:
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(standings, f, indent=2, ensure_ascii=False)
         except Exception as e:
             print(f"❌ Error saving last standings: {e}")
     
-    def load_last_standings(self, filename="last_standings.json"):
+    def load_last_standings(self, filename=None):
         """Load last standings from file"""
+        filename = filename or self.output_path("last_standings.json")
         try:
             if os.path.exists(filename):
                 with open(filename, 'r', encoding='utf-8') as f:
@@ -766,6 +3132,127 @@ class BrasileiroScraper:
             print(f"❌ Error loading last standings: {e}")
         return None
     
+    def archive_standings(self, standings, current_round, timestamp, last_standings=None):
+        """Add the table to the standings archive (seeded with last_standings.json when empty)"""
+        archive = self.standings_archive
+        try:
+            if not len(archive) and last_standings and last_standings != standings:
+                last_file = self.output_path("last_standings.json")
+                saved = datetime.fromtimestamp(os.path.getmtime(last_file)).strftime('%Y-%m-%d %H:%M:%S')
+                archive.append(last_standings, self.get_current_round(last_standings), saved)
+            if archive.append(standings, current_round, timestamp):
+                print(f"🗃️ Standings archived: Rodada {current_round} ({len(archive)} snapshots)")
+        except Exception as e:
+            print(f"❌ Error archiving standings: {e}")
+
+    def rescore_archive(self, predictions, rule=None):
+        """Score every archived table again; history entries, one per change in the scores
+
+        With the scraper's own rule a separate ScoreEngine walks the snapshots
+        in order, so each one only re-scores the teams that moved since the
+        previous snapshot. With a ScoringRule every snapshot is scored in one
+        batch by rule.score_many.
+        """
+        index = predictions if isinstance(predictions, PredictionIndex) \
+            else PredictionIndex(predictions, self.normalize_team_name)
+        snapshots = list(self.standings_archive.iter_snapshots())
+        if rule is None:
+            engine = ScoreEngine(index, self.calculate_score, self.normalize_score)
+            scored = []
+            for snapshot in snapshots:
+                sheet = engine.evaluate(snapshot['standings'], self.normalize_team_name)
+                scored.append((sheet.raw_scores, sheet.normalized_scores))
+        else:
+            actual_tables = []
+            for snapshot in snapshots:
+                actual_positions = [0] * len(index.teams)
+                for team_data in snapshot['standings']:
+                    team_id = index.team_ids.get(self.normalize_team_name(team_data['team']))
+                    if team_id is not None:
+                        actual_positions[team_id] = team_data['position']
+                actual_tables.append(actual_positions)
+            n = max([len(index.teams)] + [max(positions) for positions in actual_tables])
+            scored = []
+            for totals in rule.score_many(actual_tables, index.positions, n):
+                raw_scores = dict(zip(index.players, totals))
+                scored.append((raw_scores, {player: rule.normalize(total, n) for player, total in raw_scores.items()}))
+
+        entries = []
+        for snapshot, (raw_scores, normalized_scores) in zip(snapshots, scored):
+            if entries and entries[-1]['normalized_scores'] == normalized_scores:
+                continue
+            entries.append({
+                'timestamp': snapshot['timestamp'],
+                'round': snapshot['round'],
+                'normalized_scores': normalized_scores,
+                'raw_scores': raw_scores,
+            })
+        return entries
+
+    def run_rescore(self, predictions_file="bolao.json", write_history=False, rule=None):
+        """Re-score the whole archived season
+
+        Under the scraper's rule, write_history replaces the score history.
+        Under another rule (a ScoringRule name or JSON file) the new series is
+        always written next to it, to score_history.<rule>.jsonl.
+        """
+        self.start_metrics()
+        try:
+            predictions = self.load_predictions(predictions_file)
+            if not predictions or not len(self.standings_archive):
+                print("❌ Nothing to re-score (no predictions or empty standings archive)")
+                return None
+            if rule is not None and not isinstance(rule, ScoringRule):
+                rule = ScoringRule.load(rule)
+            with self.metrics.stage('rescore'):
+                entries = self.rescore_archive(predictions, rule)
+            latest = {entry['round']: entry for entry in entries}
+            rule_label = f" under rule '{rule.name}'" if rule is not None else ""
+            print(f"🔁 Re-scored {len(self.standings_archive)} archived tables ({len(latest)} rounds){rule_label}")
+            for round_num in sorted(latest):
+                raw_scores = latest[round_num]['raw_scores']
+                leaders = sorted(raw_scores, key=raw_scores.get, reverse=True)[:3]
+                print(f"   Rodada {round_num:>2}: " + " · ".join(f"{player} {raw_scores[player]}" for player in leaders))
+            if rule is not None:
+                series_file = self.output_path(f"score_history.{rule.name}.jsonl")
+                with self.metrics.stage('history'):
+                    ScoreHistoryStore(series_file, legacy_file=None).replace(entries)
+                print(f"📈 {len(entries)} re-scored entries written to {series_file}")
+            elif write_history:
+                with self.metrics.stage('history'):
+                    self.history_store.replace(entries)
+                    self.generate_score_graph()
+                print(f"📈 Score history rewritten with {len(entries)} re-scored entries")
+            return entries
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        finally:
+            self.finish_metrics()
+
+    def save_fingerprint(self, filename=None):
+        """Remember the table digest of the source that produced the saved standings"""
+        filename = filename or self.output_path("last_fingerprint.json")
+        if not self.standings_source or self.standings_source not in self.fingerprints:
+            return
+        try:
+            fingerprints = self.load_fingerprints(filename)
+            fingerprints[self.standings_source] = self.fingerprints[self.standings_source]
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(fingerprints, f, indent=2, ensure_ascii=False)
+        except Exception as e:
+            print(f"❌ Error saving fingerprint: {e}")
+    
+    def load_fingerprints(self, filename=None):
+        """Load the table digests saved by the last update"""
+        filename = filename or self.output_path("last_fingerprint.json")
+        try:
+            if os.path.exists(filename):
+                with open(filename, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"❌ Error loading fingerprint: {e}")
+        return {}
+    
     def standings_changed(self, current_standings, last_standings):
         """Check if standings have changed since last update"""
         if not last_standings:
@@ -787,54 +3274,980 @@ class BrasileiroScraper:
         
         return False  # No changes detected
     
-    def run_comparison(self, predictions_file="bolao.json"):
-        """Main method to run the comparison"""
-        try:
-            import sys
-            force_update = False
-            # Aceita 'force' como segundo argumento OU como primeiro argumento se não houver arquivo customizado
-            if (len(sys.argv) > 1 and sys.argv[1].lower() == "force") or (len(sys.argv) > 2 and sys.argv[2].lower() == "force"):
-                force_update = True
-
-            # Get current standings
-            current_standings = self.get_current_standings()
+    def process_standings(self, current_standings, predictions_file="bolao.json", force_update=False,
+                          predictions=None):
+        """Score one pool against already fetched standings and update its files
 
-            # Load predictions
-            predictions = self.load_predictions(predictions_file)
+        predictions, when given, is predictions_file already loaded (a PredictionIndex).
+        """
+        if predictions is None:
+            with self.metrics.stage('predictions'):
+                predictions = self.load_predictions(predictions_file)
 
-            if current_standings and predictions:
+        if current_standings and predictions:
+            self.metrics.count('players', len(predictions))
+            with self.metrics.stage('state'):
                 last_standings = self.load_last_standings()
-                if force_update or self.standings_changed(current_standings, last_standings):
-                    if force_update:
-                        print("📢 Forçando atualização do README...")
-                    else:
-                        print("📊 Standings have changed - updating README...")
-                    player_scores, raw_scores = self.compare_predictions(current_standings, predictions)
-                    self.update_readme(current_standings, predictions, raw_scores, force_update)
-                    self.save_last_standings(current_standings)
-                    print(f"\n✅ Successfully compared {len(current_standings)} teams")
-                    print(f"✅ Calculated scores for {len(predictions)} players")
-                    print("✅ README updated with new standings")
+            if force_update or self.standings_changed(current_standings, last_standings):
+                if force_update:
+                    print("📢 Forçando atualização do README...")
                 else:
-                    print("📊 No changes in standings - README not updated")
-                    print("🔄 Standings remain the same as last update")
-                    player_scores, raw_scores = self.compare_predictions(current_standings, predictions)
-                    print(f"\n✅ Successfully compared {len(current_standings)} teams")
-                    print(f"✅ Calculated scores for {len(predictions)} players")
-                    print("ℹ️  Use existing README for current results")
+                    print("📊 Standings have changed - updating README...")
+                # Scored once; console, README and result files all render this model
+                with self.metrics.stage('scoring'):
+                    results = self.build_results(current_standings, predictions)
+                print(render_console(results))
+                # README, charts and result files
+                self.update_readme(results, force_update)
+                self.notify_listeners(results)
+                with self.metrics.stage('state'):
+                    self.archive_standings(current_standings, results.round, results.updated, last_standings)
+                    self.save_last_standings(current_standings)
+                    self.save_score_cache(predictions)
+                    self.save_fingerprint()
+                print(f"\n✅ Successfully compared {len(current_standings)} teams")
+                print(f"✅ Calculated scores for {len(predictions)} players")
+                print("✅ README updated with new standings")
+                self.last_status = 'updated'
+            else:
+                print("📊 No changes in standings - README not updated")
+                print("🔄 Standings remain the same as last update")
+                with self.metrics.stage('state'):
+                    self.save_fingerprint()
+                with self.metrics.stage('scoring'):
+                    results = self.build_results(current_standings, predictions)
+                print(render_console(results))
+                self.notify_listeners(results)
+                print(f"\n✅ Successfully compared {len(current_standings)} teams")
+                print(f"✅ Calculated scores for {len(predictions)} players")
+                print("ℹ️  Use existing README for current results")
+                self.last_status = 'unchanged'
+            return True
+
+        print("❌ Failed to load data")
+        self.last_status = 'failed'
+        return False
+
+    def _http_counters(self):
+        """Cumulative HTTP client and cache counters of this scraper"""
+        counters = {
+            'http_requests': self.http.stats['requests'],
+            'bytes_fetched': self.http.stats['bytes'],
+            'http_retries': self.http.stats['retries'],
+        }
+        if self.http_cache:
+            counters['cache_hits'] = self.http_cache.hits
+            counters['cache_revalidated'] = self.http_cache.revalidated
+            counters['cache_misses'] = self.http_cache.misses
+        return counters
+
+    def start_metrics(self):
+        """Begin a new RunMetrics; HTTP counters are reported relative to this point"""
+        self.metrics = RunMetrics()
+        self._http_marks = self._http_counters()
+
+    def finish_metrics(self, filename=None):
+        """Add the HTTP counters to this run's metrics, print them and append them to run_metrics.jsonl"""
+        filename = filename or self.output_path("run_metrics.jsonl")
+        metrics = self.metrics
+        marks = getattr(self, '_http_marks', {})
+        for name, value in self._http_counters().items():
+            metrics.count(name, value - marks.get(name, 0))
+        print(f"⏱️ Run: {metrics.summary()}")
+        try:
+            metrics.write(filename)
+        except Exception as e:
+            print(f"❌ Error saving run metrics: {e}")
+
+    def run_comparison(self, predictions_file="bolao.json", force_update=None):
+        """Main method to run the comparison
+
+        Returns 'updated', 'unchanged' or 'failed' (also kept in self.last_status).
+        """
+        self.start_metrics()
+        self.last_status = 'failed'
+        try:
+            if force_update is None:
+                force_update = False
+                # Aceita 'force' como segundo argumento OU como primeiro argumento se não houver arquivo customizado
+                if (len(sys.argv) > 1 and sys.argv[1].lower() == "force") or (len(sys.argv) > 2 and sys.argv[2].lower() == "force"):
+                    force_update = True
+
+            # Get current standings; without force, an identical table ends the run here
+            known_fingerprints = None if force_update else self.load_fingerprints()
+            with self.metrics.stage('fetch'):
+                current_standings = self.get_current_standings(known_fingerprints)
+
+            if current_standings is STANDINGS_UNCHANGED:
+                print("📊 No changes in standings - README not updated")
+                print("🔄 Standings table identical to last update (fingerprint match)")
+                self.last_status = 'unchanged'
+                return self.last_status
+
+            self.process_standings(current_standings, predictions_file, force_update)
+
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        finally:
+            print(f"🌐 HTTP: {self.http.summary()}")
+            if self.http_cache:
+                print(f"🗄️ HTTP cache: {self.http_cache.summary()}")
+            self.finish_metrics()
+        return self.last_status
+
+    def simulate_season(self, standings, predictions, seasons=100000, workers=None, seed=None):
+        """Monte Carlo win probability and expected final score per player (SimulationSummary)
+
+        Seasons are split across `workers` processes (default: one per CPU),
+        each with an independent random stream spawned from `seed`.
+        """
+        if not load_numpy():
+            print("❌ numpy is required for the season simulation (pip install numpy)")
+            return None
+        engine = self.get_score_engine(predictions)
+        results = self.build_results(standings, predictions)
+        predicted = np.array([[pos or 0 for pos in row] for row in results.predicted], dtype=np.int64)
+        size = max(len(standings), int(predicted.max(initial=0)))
+        lookup = np.array(engine._lookup(size)[:size] + [0])
+        simulator = SeasonSimulator(standings, total_rounds=2 * (max(len(standings), engine.max_position) - 1))
+
+        workers = max(1, min(workers or os.cpu_count() or 1, seasons))
+        shares = [seasons // workers + (1 if i < seasons % workers else 0) for i in range(workers)]
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        with self.metrics.stage('simulation'):
+            if workers == 1:
+                chunks = [simulate_chunk(simulator, predicted, lookup, seasons, seeds[0])]
             else:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    chunks = list(executor.map(simulate_chunk, [simulator] * workers, [predicted] * workers,
+                                               [lookup] * workers, shares, seeds))
+        wins = sum(chunk[0] for chunk in chunks)
+        totals = sum(chunk[1] for chunk in chunks)
+        return SimulationSummary(results.players, seasons, wins, totals, self.normalize_score)
+
+    def run_simulation(self, predictions_file="bolao.json", seasons=100000, workers=None, seed=None):
+        """Fetch the standings (or reuse the last saved ones) and print the simulated outcome"""
+        self.start_metrics()
+        try:
+            with self.metrics.stage('fetch'):
+                standings = self.get_current_standings()
+            if not standings:
+                print("⚠️ Using the last saved standings")
+                standings = self.load_last_standings()
+            predictions = self.load_predictions(predictions_file)
+            if not standings or not predictions:
+                print("❌ Failed to load data")
+                return None
+            summary = self.simulate_season(standings, predictions, seasons, workers, seed)
+            if summary is not None:
+                print(render_simulation(summary))
+            return summary
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        finally:
+            self.finish_metrics()
+
+    def load_pools(self, source):
+        """List the pools of a batch: a directory of prediction files or a JSON manifest
+
+        Manifest format: {"pools": [{"name": ..., "predictions": ..., "output_dir": ...}]},
+        relative paths being resolved against the manifest's directory. In a
+        directory, every *.json file (dotfiles excluded) is a pool whose files go
+        to <dir>/<name>/.
+        """
+        pools = []
+        if os.path.isdir(source):
+            for filename in sorted(os.listdir(source)):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() == ".json" and not filename.startswith("."):
+                    pools.append({
+                        'name': name,
+                        'predictions': os.path.join(source, filename),
+                        'output_dir': os.path.join(source, name),
+                    })
+        else:
+            with open(source, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            base_dir = os.path.dirname(os.path.abspath(source))
+            for entry in manifest.get('pools', []):
+                name = entry.get('name') or os.path.splitext(os.path.basename(entry['predictions']))[0]
+                pools.append({
+                    'name': name,
+                    'predictions': os.path.join(base_dir, entry['predictions']),
+                    'output_dir': os.path.join(base_dir, entry.get('output_dir', name)),
+                })
+        return pools
+
+    def run_batch(self, source, force_update=False, workers=None, large_pool_players=500):
+        """Fetch standings once and score every pool of a directory/manifest against them"""
+        self.start_metrics()
+        batch_dir = source if os.path.isdir(source) else os.path.dirname(os.path.abspath(source))
+        try:
+            pools = self.load_pools(source)
+            if not pools:
+                print(f"❌ No pools found in {source}")
+                return
+            print(f"📚 Batch mode: {len(pools)} pools from {source}")
+
+            # One scrape for every pool. Each pool keeps the fingerprint of the
+            # table it was last scored against: the fetch may stop early only
+            # for a table every pool already has (a new pool has none)
+            fingerprint_files = [os.path.join(pool['output_dir'], "last_fingerprint.json") for pool in pools]
+            known_fingerprints = None
+            if not force_update:
+                pool_fingerprints = [self.load_fingerprints(filename) for filename in fingerprint_files]
+                known_fingerprints = {name: digest for name, digest in pool_fingerprints[0].items()
+                                      if all(other.get(name) == digest for other in pool_fingerprints[1:])}
+            with self.metrics.stage('fetch'):
+                current_standings = self.get_current_standings(known_fingerprints)
+
+            if current_standings is STANDINGS_UNCHANGED:
+                print("📊 No changes in standings - no pool updated")
+                return
+            if not current_standings:
                 print("❌ Failed to load data")
+                return
+
+            # Each pool is loaded once, here, and handed to its run. A pool that
+            # does not load is left to report the error in its own section
+            with self.metrics.stage('predictions'), contextlib.redirect_stdout(io.StringIO()):
+                indexes = [self.load_predictions(pool['predictions']) for pool in pools]
+            # Big pools are worth a process each; small ones are cheaper inline
+            total_players = sum(len(index) for index in indexes if index is not None)
+
+            # Each pool appends its own stage metrics to <output_dir>/run_metrics.jsonl
+            with self.metrics.stage('pools'):
+                if len(pools) > 1 and total_players >= large_pool_players:
+                    from concurrent.futures import ProcessPoolExecutor
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        results = list(executor.map(run_pool, pools, [current_standings] * len(pools),
+                                                    [force_update] * len(pools), [self.outputs] * len(pools),
+                                                    indexes))
+                else:
+                    results = [run_pool(pool, current_standings, force_update, self.outputs, index)
+                               for pool, index in zip(pools, indexes)]
+
+            failed = 0
+            for (name, ok, output), fingerprint_file in zip(results, fingerprint_files):
+                print(f"\n===== 🏟️ {name} =====")
+                print(output, end="")
+                if ok:
+                    self.save_fingerprint(fingerprint_file)
+                else:
+                    failed += 1
 
+            print(f"\n✅ Batch finished: {len(pools) - failed}/{len(pools)} pools updated")
+
+        except Exception as e:
+            print(f"❌ Error: {e}")
+        finally:
+            print(f"🌐 HTTP: {self.http.summary()}")
+            if self.http_cache:
+                print(f"🗄️ HTTP cache: {self.http_cache.summary()}")
+            self.finish_metrics(os.path.join(batch_dir, "run_metrics.jsonl"))
+
+
+def run_pool(pool, current_standings, force_update=False, outputs=(), predictions=None):
+    """Score one batch pool in its own namespace; returns (name, ok, captured output)
+
+    predictions is the pool's PredictionIndex when the batch already loaded it.
+    """
+    buffer = io.StringIO()
+    ok = False
+    with contextlib.redirect_stdout(buffer):
+        try:
+            os.makedirs(pool['output_dir'], exist_ok=True)
+            readme_path = os.path.join(pool['output_dir'], "README.md")
+            if not os.path.exists(readme_path):
+                with open(readme_path, 'w', encoding='utf-8') as f:
+                    f.write(f"# Bolão {pool['name']}\n")
+            scraper = BrasileiroScraper(cache_dir=None, output_dir=pool['output_dir'], outputs=outputs)
+            ok = scraper.process_standings(current_standings, pool['predictions'], force_update, predictions)
+            scraper.finish_metrics()
         except Exception as e:
             print(f"❌ Error: {e}")
+    return pool['name'], ok, buffer.getvalue()
+
+
+# When Brasileirão matches are usually played, local (Brasília) time:
+# (weekday, start, end) with Monday = 0
+MATCH_WINDOWS = [
+    (0, "19:00", "23:30"),
+    (2, "19:00", "23:59"),
+    (3, "19:00", "23:59"),
+    (5, "15:30", "23:59"),
+    (6, "10:30", "23:00"),
+]
+
+
+class Watcher:
+    """Resident polling loop around run_comparison
+
+    Polls every fast_interval seconds inside a match window and every
+    idle_interval outside, doubling the wait (up to window_max_interval /
+    max_interval) for each poll in a row that finds the standings unchanged.
+    The schedule is kept in a state file so a restarted watcher waits for the
+    pending poll instead of scraping and scoring again right away.
+    """
+
+    def __init__(self, scraper, predictions_file="bolao.json", fast_interval=120, window_max_interval=600,
+                 idle_interval=900, max_interval=4 * 3600, windows=None, state_file=None):
+        self.scraper = scraper
+        self.predictions_file = predictions_file
+        self.fast_interval = fast_interval
+        self.window_max_interval = window_max_interval
+        self.idle_interval = idle_interval
+        self.max_interval = max_interval
+        self.windows = MATCH_WINDOWS if windows is None else windows
+        self.state_file = state_file or scraper.output_path("watch_state.json")
+        self.stop_event = threading.Event()
+        self.state = {'unchanged_streak': 0, 'polls': 0, 'last_poll': None, 'last_change': None, 'next_poll': None}
+
+        # Resident process: revalidate with the server instead of trusting the
+        # cache TTL, which would hide changes between two fast polls
+        if scraper.http_cache:
+            scraper.http_cache.ttl = min(scraper.http_cache.ttl, fast_interval // 2)
+
+    def _window_bounds(self, now):
+        """(start, end) datetimes of every window from yesterday to a week ahead"""
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        for day in range(-1, 8):
+            date = today + timedelta(days=day)
+            for weekday, start, end in self.windows:
+                if date.weekday() != weekday:
+                    continue
+                start_h, start_m = map(int, start.split(":"))
+                end_h, end_m = map(int, end.split(":"))
+                yield (date.replace(hour=start_h, minute=start_m),
+                       date.replace(hour=end_h, minute=end_m))
+
+    def in_match_window(self, now):
+        return any(start <= now < end for start, end in self._window_bounds(now))
+
+    def next_window_start(self, now):
+        starts = [start for start, _ in self._window_bounds(now) if start > now]
+        return min(starts) if starts else None
+
+    def next_interval(self, now):
+        """Seconds until the next poll"""
+        backoff = 2 ** min(self.state['unchanged_streak'], 16)
+        if self.in_match_window(now):
+            return min(self.window_max_interval, self.fast_interval * backoff)
+        interval = min(self.max_interval, self.idle_interval * backoff)
+        # Never sleep through the beginning of a match window
+        window_start = self.next_window_start(now)
+        if window_start is not None:
+            interval = min(interval, max(self.fast_interval, (window_start - now).total_seconds()))
+        return interval
+
+    def load_state(self):
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, 'r', encoding='utf-8') as f:
+                    self.state.update(json.load(f))
+        except Exception as e:
+            print(f"❌ Error loading watch state: {e}")
+
+    def save_state(self):
+        temp_file = self.state_file + ".tmp"
+        try:
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(temp_file, self.state_file)
+        except Exception as e:
+            print(f"❌ Error saving watch state: {e}")
+
+    def stop(self, *args):
+        """Finish the current poll and exit (also the SIGINT/SIGTERM handler)"""
+        if not self.stop_event.is_set():
+            print("\n🛑 Stop requested - finishing the current poll...")
+        self.stop_event.set()
+
+    def _install_signal_handlers(self):
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+        previous = {}
+        for name in ("SIGINT", "SIGTERM"):
+            signum = getattr(signal, name, None)
+            if signum is not None:
+                previous[signum] = signal.signal(signum, self.stop)
+        return previous
+
+    def run(self, force_update=False, max_polls=None):
+        """Poll until stopped (or max_polls polls); returns the number of polls made"""
+        previous_handlers = self._install_signal_handlers()
+        self.load_state()
+        polls = 0
+        try:
+            # Resume the schedule of a previous watcher instead of polling at once
+            if self.state.get('next_poll') and not force_update:
+                wait = (datetime.strptime(self.state['next_poll'], '%Y-%m-%d %H:%M:%S') - datetime.now()).total_seconds()
+                if wait > 0:
+                    print(f"⏳ Resuming watch: next check at {self.state['next_poll']}")
+                    self.stop_event.wait(wait)
+
+            while not self.stop_event.is_set():
+                status = self.scraper.run_comparison(self.predictions_file, force_update)
+                force_update = False
+                polls += 1
+                now = datetime.now()
+                self.state['polls'] += 1
+                self.state['last_poll'] = now.strftime('%Y-%m-%d %H:%M:%S')
+                if status == 'updated':
+                    self.state['unchanged_streak'] = 0
+                    self.state['last_change'] = self.state['last_poll']
+                else:
+                    # Unchanged standings and failed polls both back off
+                    self.state['unchanged_streak'] += 1
+
+                interval = self.next_interval(now)
+                self.state['next_poll'] = (now + timedelta(seconds=interval)).strftime('%Y-%m-%d %H:%M:%S')
+                self.save_state()
+                if max_polls is not None and polls >= max_polls:
+                    break
+                window = "match window" if self.in_match_window(now) else "outside match windows"
+                print(f"💤 {status}, {window}: next check in {interval / 60:.1f} min ({self.state['next_poll']})")
+                self.stop_event.wait(interval)
+        finally:
+            self.scraper.http.close()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            print(f"👋 Watch stopped after {polls} polls")
+        return polls
+
+
+class ApiSnapshot:
+    """Read-only view of one set of results for the API
+
+    Bodies are serialized once, on first request, and kept with their ETag:
+    a request never touches a file or re-encodes JSON. Snapshots are replaced
+    whole, never modified, so the server thread needs no lock.
+    """
+
+    ENDPOINTS = ["/standings", "/scores", "/teams", "/teams/<time>", "/players/<nome>",
+                 "/history", "/history/<rodada>"]
+    MAX_ALIASES = 1024  # raw paths remembered as spellings of a cached route
+
+    def __init__(self, results=None, history=None, source=None):
+        self.results = results
+        self.history = history or []
+        self.source = source
+        self._bodies = {}  # route parts -> (body, etag)
+        self._aliases = {}  # raw path -> route parts, for paths that had a body
+        self._team_rows = {}
+        if results is not None:
+            for row, team_data in enumerate(results.standings):
+                canonical = TEAM_REGISTRY.canonical(team_data['team']) or team_data['team']
+                self._team_rows.setdefault(canonical, row)
+
+    def _team_payload(self, row):
+        results = self.results
+        team_data = results.standings[row]
+        return {
+            **team_data,
+            'predictions': {player: {'predicted': predicted_pos, 'score': score}
+                            for player, predicted_pos, score
+                            in zip(results.players, results.predicted[row], results.scores[row])},
+        }
+
+    def _player_payload(self, player):
+        results = self.results
+        column = results.player_ids[player]
+        return {
+            'player': player,
+            'rank': results.ranking.index(player) + 1,
+            'raw_score': results.raw_scores[player],
+            'normalized_score': results.normalized_scores[player],
+            'teams': [{'team': team_data['team'], 'position': team_data['position'],
+                       'predicted': predicted_row[column], 'score': score_row[column]}
+                      for team_data, predicted_row, score_row in results.rows()],
+        }
+
+    @staticmethod
+    def _route(path):
+        """Route parts a path is dispatched and cached on (query string dropped, team canonical)"""
+        path = path.partition('?')[0]
+        parts = tuple(filter(None, path.split('/')))
+        if '%' in path:
+            parts = tuple(urllib.parse.unquote(part) for part in parts)
+        if len(parts) == 2 and parts[0] == 'teams':
+            parts = (parts[0], TEAM_REGISTRY.canonical(parts[1]) or parts[1])
+        return parts
+
+    def _payload(self, parts):
+        """JSON-ready payload of a route (from _route), None when there is none"""
+        results = self.results
+        if not parts:
+            return {'updated': results.updated, 'round': results.round, 'source': self.source,
+                    'endpoints': self.ENDPOINTS}
+        route, arg = parts[0], parts[1] if len(parts) > 1 else None
+        if len(parts) > 2:
+            return None
+        if route == 'standings' and arg is None:
+            return {'updated': results.updated, 'round': results.round, 'source': self.source,
+                    'standings': [{key: team_data[key] for key in ('position', 'team', 'points', 'games')}
+                                  for team_data in results.standings]}
+        if route == 'scores' and arg is None:
+            return {'updated': results.updated, 'round': results.round,
+                    'ranking': ranking_entries(results)}
+        if route == 'teams':
+            if arg is None:
+                return {'updated': results.updated,
+                        'teams': [self._team_payload(row) for row in range(len(results.standings))]}
+            row = self._team_rows.get(arg)
+            return None if row is None else self._team_payload(row)
+        if route == 'players' and arg is not None:
+            return self._player_payload(arg) if arg in results.player_ids else None
+        if route == 'history':
+            if arg is None:
+                return {'rounds': self.history}
+            matches = [entry for entry in self.history if str(entry.get('round')) == arg]
+            return matches[-1] if matches else None
+        return None
+
+    def get(self, path):
+        """(body, etag) of a path, None for unknown routes
+
+        Bodies are cached per route, so the cache holds at most one entry per
+        route, team, player and round however the path is spelled; the raw
+        path shortcut in front of it is capped at MAX_ALIASES.
+        """
+        parts = self._aliases.get(path)
+        if parts is not None:
+            return self._bodies[parts]
+        parts = self._route(path)
+        cached = self._bodies.get(parts)
+        if cached is None:
+            payload = self._payload(parts)
+            if payload is None:
+                return None
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            cached = self._bodies[parts] = (body, '"' + hashlib.sha1(body).hexdigest() + '"')
+        if len(self._aliases) < self.MAX_ALIASES:
+            self._aliases[path] = parts
+        return cached
+
+
+class ApiServer:
+    """Read-only HTTP/JSON API (asyncio, keep-alive, ETag / 304) over the latest ApiSnapshot
+
+    publish() is a result listener: the watcher thread swaps in a new snapshot
+    after every scoring while the event loop keeps serving the previous one.
+    """
+
+    REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 503: "Service Unavailable"}
+
+    def __init__(self, host="127.0.0.1", port=8080):
+        self.host = host
+        self.port = port
+        self.snapshot = ApiSnapshot()
+        self.requests = 0
+        self._stop = None
+
+    def publish(self, scraper, results):
+        """Replace the served snapshot (history is read here, once per update)"""
+        self.snapshot = ApiSnapshot(results, scraper.history_store.latest_per_round(), scraper.standings_source)
+
+    def _response(self, status, body=b"", etag=None, head=False, keep_alive=True):
+        headers = [f"HTTP/1.1 {status} {self.REASONS[status]}"]
+        if status != 304:
+            headers.append("Content-Type: application/json; charset=utf-8")
+            headers.append(f"Content-Length: {len(body)}")
+        if etag:
+            headers.append(f"ETag: {etag}")
+            headers.append("Cache-Control: no-cache")
+        headers.append("Connection: keep-alive" if keep_alive else "Connection: close")
+        head_bytes = ("\r\n".join(headers) + "\r\n\r\n").encode('latin-1')
+        return head_bytes if head or status == 304 else head_bytes + body
+
+    def _error(self, status, message, keep_alive=True):
+        return self._response(status, json.dumps({'error': message}).encode('utf-8'), keep_alive=keep_alive)
+
+    def respond(self, method, path, headers):
+        """Response bytes for one request (no I/O: everything comes from the snapshot)"""
+        keep_alive = headers.get('connection', '').lower() != 'close'
+        if method not in ("GET", "HEAD"):
+            return self._error(405, "read-only API: GET and HEAD only", keep_alive)
+        snapshot = self.snapshot
+        if snapshot.results is None:
+            return self._error(503, "no results yet", keep_alive)
+        found = snapshot.get(path)
+        if found is None:
+            return self._error(404, f"unknown route {path}", keep_alive)
+        body, etag = found
+        if_none_match = headers.get('if-none-match')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            if '*' in tags or etag in tags or f"W/{etag}" in tags:
+                return self._response(304, etag=etag, keep_alive=keep_alive)
+        return self._response(200, body, etag, head=method == "HEAD", keep_alive=keep_alive)
+
+    async def handle(self, reader, writer):
+        import asyncio
+        try:
+            while True:
+                try:
+                    request = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = request.decode('latin-1').split("\r\n")
+                parts = lines[0].split()
+                if len(parts) != 3:
+                    writer.write(self._error(400, "malformed request line", keep_alive=False))
+                    break
+                method, path, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, sep, value = line.partition(":")
+                    if sep:
+                        headers[name.strip().lower()] = value.strip()
+                if version == "HTTP/1.0" and headers.get('connection', '').lower() != 'keep-alive':
+                    headers['connection'] = 'close'
+                self.requests += 1
+                writer.write(self.respond(method, path, headers))
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, ready=None):
+        """Serve until stop() is called; ready(port) is called once listening"""
+        import asyncio
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"🛰️ API listening on http://{self.host}:{self.port}/")
+        if ready is not None:
+            ready(self.port)
+        async with server:
+            await self._stop.wait()
+        print(f"🛰️ API stopped after {self.requests} requests")
+
+    def stop(self, *args):
+        """Thread-safe: ask serve() to return"""
+        if self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+
+class SiteGenerator:
+    """Static drill-down pages (markdown): an index, one page per player and one per team
+
+    Pages are rebuilt from a ResultsModel, but only those whose inputs
+    changed. Every page declares the inputs it is drawn from:
+    - team:<name>: position, points and games of a team (its team page);
+    - positions: where every team stands (player pages list their deviation on each);
+    - player:<name> / history:<name>: a player's rank and score / score by round;
+    - round, ranking, table: what the index lists;
+    - pool: the predictions (every page).
+    site/.manifest.json keeps the digest of every input and the inputs of
+    every page. A run that only changes two teams' points rewrites those two
+    team pages and the index; when teams move, the player pages follow, but
+    the pages of teams that kept their row are left alone.
+    """
+
+    def __init__(self, site_dir="site"):
+        self.site_dir = site_dir
+        self.manifest_file = os.path.join(site_dir, ".manifest.json")
+        self.published = False
+
+    @staticmethod
+    def _digest(value):
+        return hashlib.sha1(json.dumps(value, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _slugs(names):
+        """Unique file name per name, in order ("-2", "-3"... on collisions)"""
+        slugs, taken = {}, set()
+        for name in names:
+            slug = base = slugify(name)
+            n = 1
+            while slug in taken:
+                n += 1
+                slug = f"{base}-{n}"
+            taken.add(slug)
+            slugs[name] = slug
+        return slugs
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'inputs': {}, 'pages': {}}
+
+    def _write(self, relative_path, text):
+        path = os.path.join(self.site_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def _player_page(self, results, player, rank, series, team_slugs):
+        column = results.player_ids[player]
+        lines = [
+            f"# {player}",
+            "",
+            "[← Classificação](../index.md)",
+            "",
+            f"**Posição no bolão:** {rank}º de {len(results.players)} · "
+            f"**Pontos:** {results.raw_scores[player]} ({results.normalized_scores[player]} normalizados)",
+            "",
+            "| Time | Previsto | Real | Desvio | Pontos |",
+            "|------|----------|------|--------|--------|",
+        ]
+        for team_data, predicted_row, score_row in results.rows():
+            predicted_pos = predicted_row[column]
+            team = f"[{team_data['team']}](../times/{team_slugs[team_data['team']]}.md)"
+            if predicted_pos is None:
+                lines.append(f"| {team} | -- | {team_data['position']} | -- | -- |")
+            else:
+                deviation = abs(predicted_pos - team_data['position'])
+                lines.append(f"| {team} | {predicted_pos}° | {team_data['position']}° | {deviation} | {score_row[column]} |")
+        lines.extend(["", "### 📈 Evolução", ""])
+        if series:
+            lines.extend(["| Rodada | Pontuação |", "|--------|-----------|"])
+            lines.extend(f"| R{round_num} | {score} |" for round_num, score in series)
+        else:
+            lines.append("*Nenhum histórico disponível ainda.*")
+        return "\n".join(lines) + "\n"
+
+    def _team_page(self, results, row, player_slugs):
+        team_data = results.standings[row]
+        entries = [(score, player, predicted_pos) for player, predicted_pos, score
+                   in zip(results.players, results.predicted[row], results.scores[row])]
+        entries.sort(key=lambda entry: (-(entry[0] or 0), entry[1]))
+        lines = [
+            f"# {team_data['team']}",
+            "",
+            "[← Classificação](../index.md)",
+            "",
+            f"**Posição:** {team_data['position']}º · **Pontos:** {team_data.get('points')} · "
+            f"**Jogos:** {team_data.get('games')}",
+            "",
+            "| Jogador | Previsto | Desvio | Pontos |",
+            "|---------|----------|--------|--------|",
+        ]
+        for score, player, predicted_pos in entries:
+            link = f"[{player}](../jogadores/{player_slugs[player]}.md)"
+            if predicted_pos is None:
+                lines.append(f"| {link} | -- | -- | -- |")
+            else:
+                lines.append(f"| {link} | {predicted_pos}° | {abs(predicted_pos - team_data['position'])} | {score} |")
+        return "\n".join(lines) + "\n"
+
+    def _index_page(self, results, player_slugs, team_slugs):
+        lines = [
+            "# 🏆 Bolão Brasileirão",
+            "",
+            f"**Rodada:** {results.round}",
+            "",
+            "## Participantes",
+            "",
+            "| # | Jogador | Pontos | Normalizado |",
+            "|---|---------|--------|-------------|",
+        ]
+        for rank, player in enumerate(results.ranking, 1):
+            lines.append(f"| {rank} | [{player}](jogadores/{player_slugs[player]}.md) | "
+                         f"{results.raw_scores[player]} | {results.normalized_scores[player]} |")
+        lines.extend(["", "## Times", "", "| # | Time | Pontos | Jogos |", "|---|------|--------|-------|"])
+        for team_data in results.standings:
+            lines.append(f"| {team_data['position']} | [{team_data['team']}](times/{team_slugs[team_data['team']]}.md) | "
+                         f"{team_data.get('points')} | {team_data.get('games')} |")
+        return "\n".join(lines) + "\n"
+
+    def generate(self, results, history=None, pool_digest=None):
+        """Rewrite the pages whose inputs changed; returns the relative paths written"""
+        history = history or []
+        manifest = self._load_manifest()
+        player_slugs = self._slugs(results.players)
+        team_slugs = self._slugs(team_data['team'] for team_data in results.standings)
+        ranks = {player: rank for rank, player in enumerate(results.ranking, 1)}
+
+        # Current value digest of every input
+        inputs = {
+            'pool': pool_digest or self._digest(results.players),
+            'round': self._digest(results.round),
+            'positions': self._digest([[team_data['team'], team_data['position']] for team_data in results.standings]),
+            'ranking': self._digest([[player, results.raw_scores[player], results.normalized_scores[player]]
+                                     for player in results.ranking]),
+            'table': self._digest([[team_data['team'], team_data['position'], team_data.get('points'),
+                                    team_data.get('games')] for team_data in results.standings]),
+        }
+        for team_data in results.standings:
+            inputs['team:' + team_data['team']] = self._digest(
+                [team_data['position'], team_data.get('points'), team_data.get('games')])
+        series = {player: [] for player in results.players}
+        for entry in history:
+            for player, score in entry.get('normalized_scores', {}).items():
+                if player in series:
+                    series[player].append((entry.get('round'), score))
+        for player in results.players:
+            inputs['player:' + player] = self._digest([ranks[player], results.raw_scores[player],
+                                                       results.normalized_scores[player]])
+            inputs['history:' + player] = self._digest(series[player])
+        changed = {key for key, digest in inputs.items() if manifest['inputs'].get(key) != digest}
+
+        # Page -> (inputs it depends on, renderer)
+        pages = {'index.md': (['pool', 'round', 'ranking', 'table'],
+                              lambda: self._index_page(results, player_slugs, team_slugs))}
+        for player in results.players:
+            pages[f"jogadores/{player_slugs[player]}.md"] = (
+                ['pool', 'positions', 'player:' + player, 'history:' + player],
+                lambda player=player: self._player_page(results, player, ranks[player], series[player], team_slugs))
+        for row, team_data in enumerate(results.standings):
+            pages[f"times/{team_slugs[team_data['team']]}.md"] = (
+                ['pool', 'team:' + team_data['team']],
+                lambda row=row: self._team_page(results, row, player_slugs))
+
+        written = []
+        for path, (dependencies, render) in pages.items():
+            if manifest['pages'].get(path) == dependencies and not changed.intersection(dependencies) \
+                    and os.path.exists(os.path.join(self.site_dir, path)):
+                continue
+            self._write(path, render())
+            written.append(path)
+
+        # Pages of players or teams that left the pool/table
+        removed = [path for path in manifest['pages'] if path not in pages]
+        for path in removed:
+            try:
+                os.remove(os.path.join(self.site_dir, path))
+            except OSError:
+                pass
+
+        if written or removed or changed:
+            manifest = {'inputs': inputs, 'pages': {path: dependencies for path, (dependencies, _) in pages.items()}}
+            self._write(".manifest.json", json.dumps(manifest, ensure_ascii=False))
+        return written
+
+    def publish(self, scraper, results):
+        """Result listener: bring the site up to date with a run's results"""
+        engine = scraper._score_engine
+        written = self.generate(results, scraper.history_store.latest_per_round(),
+                                engine.digest if engine is not None else None)
+        self.published = True
+        if written:
+            print(f"🗂️ Site: {len(written)} pages written to {self.site_dir}")
+        else:
+            print(f"🗂️ Site: all pages in {self.site_dir} up to date")
+
+
+def serve_api(scraper, predictions_file="bolao.json", host="127.0.0.1", port=8080, force_update=False):
+    """API in the main thread, fed by a Watcher polling in a background thread"""
+    import asyncio
+    api = ApiServer(host, port)
+    scraper.result_listeners.append(api.publish)
+
+    # Serve the last stored results right away, before the first poll finishes
+    last_standings = scraper.load_last_standings()
+    predictions = scraper.load_predictions(predictions_file)
+    if last_standings and predictions:
+        api.publish(scraper, scraper.build_results(last_standings, predictions))
+
+    watcher = Watcher(scraper, predictions_file)
+    thread = threading.Thread(target=watcher.run, args=(force_update,), name="watcher", daemon=True)
+    thread.start()
+
+    previous = {}
+    for name in ("SIGINT", "SIGTERM"):
+        signum = getattr(signal, name, None)
+        if signum is not None:
+            previous[signum] = signal.signal(signum, lambda *args: (watcher.stop(), api.stop()))
+    try:
+        asyncio.run(api.serve())
+    finally:
+        watcher.stop()
+        thread.join()
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+def build_site(scraper, predictions_file="bolao.json", site_dir="site", force_update=False):
+    """Run a normal update and bring the drill-down pages up to date with its results"""
+    site = SiteGenerator(scraper.output_path(site_dir))
+    scraper.result_listeners.append(site.publish)
+    status = scraper.run_comparison(predictions_file, force_update)
+    if not site.published and not os.path.exists(site.manifest_file):
+        # Standings unchanged (fingerprint match) but no site yet: build it from the last saved table
+        last_standings = scraper.load_last_standings()
+        predictions = scraper.load_predictions(predictions_file)
+        if last_standings and predictions:
+            site.publish(scraper, scraper.build_results(last_standings, predictions))
+    return status
+
+
+def profile_run(run, profile_file="run_profile.prof", top=25):
+    """Run under cProfile, save the raw stats and print the hottest paths
+
+    Only the calling thread is profiled: the concurrent source fetches show up
+    as time spent waiting in get_current_standings.
+    """
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run)
+    finally:
+        profiler.dump_stats(profile_file)
+        print(f"\n🔬 Profile saved to {profile_file} (top {top} by cumulative time):")
+        pstats.Stats(profiler).strip_dirs().sort_stats('cumulative').print_stats(top)
+
 
 def main():
-    scraper = BrasileiroScraper()
-    import sys
-    # Detect 'force' argument and set predictions file correctly
-    args = [arg for arg in sys.argv[1:] if arg.lower() != "force"]
-    predictions_file = args[0] if args else "bolao.json"
-    scraper.run_comparison(predictions_file)
+    # Detect 'force'/'--profile'/'--json'/'--csv' arguments and set predictions file correctly
+    force_update = any(arg.lower() == "force" for arg in sys.argv[1:])
+    profile = "--profile" in sys.argv[1:]
+    outputs = [arg[2:] for arg in sys.argv[1:] if arg[2:] in RESULT_FILES and arg.startswith("--")]
+    # --name=value options (serve: --port, --host; simulate: --seasons, --workers, --seed; rescore: --rule;
+    # site: --site-dir)
+    options = dict(arg[2:].split("=", 1) for arg in sys.argv[1:] if arg.startswith("--") and "=" in arg)
+    args = [arg for arg in sys.argv[1:]
+            if arg.lower() != "force" and arg not in ("--profile", "--verify", "--write-history", "--player-charts") and arg[2:] not in RESULT_FILES
+            and not (arg.startswith("--") and "=" in arg)]
+    scraper = BrasileiroScraper(outputs=outputs)
+    scraper.verify_scores = "--verify" in sys.argv[1:]
+    scraper.player_charts = "--player-charts" in sys.argv[1:]
+    if args and args[0] == "batch":
+        # python scrape_brasileirao_simple.py batch <pasta|manifesto.json> [force]
+        run = lambda: scraper.run_batch(args[1] if len(args) > 1 else "pools", force_update)
+    elif args and args[0] == "serve":
+        # python scrape_brasileirao_simple.py serve [bolao.json] [--port=8080] [--host=127.0.0.1]
+        port = int(options.get('port', 8080))
+        host = options.get('host', "127.0.0.1")
+        run = lambda: serve_api(scraper, args[1] if len(args) > 1 else "bolao.json", host, port, force_update)
+    elif args and args[0] == "simulate":
+        # python scrape_brasileirao_simple.py simulate [bolao.json] [--seasons=100000] [--workers=N] [--seed=N]
+        seasons = int(options.get('seasons', 100000))
+        workers = int(options['workers']) if 'workers' in options else None
+        seed = int(options['seed']) if 'seed' in options else None
+        run = lambda: scraper.run_simulation(args[1] if len(args) > 1 else "bolao.json", seasons, workers, seed)
+    elif args and args[0] == "rescore":
+        # python scrape_brasileirao_simple.py rescore [bolao.json] [--write-history] [--rule=zonas|regra.json]
+        write_history = "--write-history" in sys.argv[1:]
+        run = lambda: scraper.run_rescore(args[1] if len(args) > 1 else "bolao.json", write_history,
+                                          options.get('rule'))
+    elif args and args[0] == "site":
+        # python scrape_brasileirao_simple.py site [bolao.json] [--site-dir=site] [force]
+        site_dir = options.get('site-dir', "site")
+        run = lambda: build_site(scraper, args[1] if len(args) > 1 else "bolao.json", site_dir, force_update)
+    elif args and args[0] == "watch":
+        # python scrape_brasileirao_simple.py watch [bolao.json] [force]
+        watcher = Watcher(scraper, args[1] if len(args) > 1 else "bolao.json")
+        run = lambda: watcher.run(force_update)
+    else:
+        predictions_file = args[0] if args else "bolao.json"
+        run = lambda: scraper.run_comparison(predictions_file, force_update)
+    if profile:
+        profile_run(run)
+    else:
+        run()
 
 if __name__ == "__main__":
     main()
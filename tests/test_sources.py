@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Offline tests of the standings fetch against a local stand-in HTTP server.
+
+Every source points at http://127.0.0.1:<port>/<route>; each test sets what
+the routes answer (a recorded page, a 503, a hang...). No network access.
+
+    python -m unittest discover tests     (or: python -m pytest tests)
+"""
+
+import http.server
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+from scrape_brasileirao_simple import STANDINGS_UNCHANGED, BrasileiroScraper, HttpClient
+
+FIXTURES_DIR = os.path.join(os.path.dirname(TESTS_DIR), "benchmarks", "fixtures")
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+ESPN_PAGE = fixture("espn_bra1.html")
+GAZETA_PAGE = fixture("gazeta_serie_a.html")
+
+
+class StandInServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    """Keep-alive HTTP/1.1 server whose routes are plain functions(handler)"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = {}          # path -> requests received
+        self.connections = 0    # TCP connections accepted
+        self.disconnected = threading.Event()  # a hanging route saw its client go away
+        self.release = threading.Event()       # lets hanging routes return at tearDown
+        super().__init__(('127.0.0.1', 0), StandInHandler)
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def get_request(self):
+        self.connections += 1
+        return super().get_request()
+
+    def handle_error(self, request, client_address):
+        pass  # clients dropping connections is what several tests are about
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.hits[self.path] = server.hits.get(self.path, 0) + 1
+        server.routes[self.path](self)
+
+    def send_body(self, body, status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def page(body, delay=0.0, headers=()):
+    def route(handler):
+        time.sleep(delay)
+        handler.send_body(body, headers=headers)
+    return route
+
+
+def status(code):
+    def route(handler):
+        handler.send_body(b"", status=code)
+    return route
+
+
+def failing(times, then):
+    """503 for the first `times` requests, then the `then` route"""
+    calls = []
+
+    def route(handler):
+        calls.append(1)
+        if len(calls) <= times:
+            handler.send_body(b"", status=503)
+        else:
+            then(handler)
+    return route
+
+
+def revalidated(body, etag):
+    """200 with an ETag, or 304 when the client already holds that ETag"""
+    def route(handler):
+        if handler.headers.get('If-None-Match') == etag:
+            handler.send_response(304)
+            handler.send_header('ETag', etag)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+        else:
+            handler.send_body(body, headers=[('ETag', etag)])
+    return route
+
+
+def hang(handler):
+    """Accept the request and never answer; notice when the client closes the connection"""
+    server = handler.server
+    handler.connection.settimeout(0.05)
+    while not server.release.is_set():
+        try:
+            if handler.connection.recv(1) == b"":
+                server.disconnected.set()
+                return
+        except OSError as e:
+            if 'timed out' not in str(e):
+                server.disconnected.set()
+                return
+
+
+class SourceTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.workdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.server.release.set()
+        self.server.shutdown()
+        self.server.server_close()
+        self.workdir.cleanup()
+
+    def source(self, name, route, layout='espn', timeout=None):
+        source = {'name': name, 'layout': layout, 'url': self.server.base + route}
+        if timeout is not None:
+            source['timeout'] = timeout
+        return source
+
+    def scraper(self, sources, cache=False, **options):
+        cache_dir = os.path.join(self.workdir.name, "cache") if cache else None
+        scraper = BrasileiroScraper(sources=sources, cache_dir=cache_dir, output_dir=self.workdir.name,
+                                    **options)
+        self.addCleanup(scraper.http.close)
+        return scraper
+
+    def fetch(self, scraper, **kwargs):
+        """get_current_standings with its console output discarded; (standings, seconds)"""
+        with open(os.devnull, 'w', encoding='utf-8') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                start = time.monotonic()
+                standings = scraper.get_current_standings(**kwargs)
+                return standings, time.monotonic() - start
+            finally:
+                sys.stdout = stdout
+
+    def assertNoFetchThreads(self, within=1.0):
+        """No source thread outlives get_current_standings by more than `within` seconds"""
+        deadline = time.monotonic() + within
+        while any(thread.name.startswith("standings") for thread in threading.enumerate()):
+            if time.monotonic() > deadline:
+                self.fail("a standings thread is still running after the fetch returned")
+            time.sleep(0.02)
+
+
+class FirstValidSourceWins(SourceTestCase):
+    def test_fast_source_wins_and_slow_one_is_aborted(self):
+        self.server.routes = {'/fast': page(ESPN_PAGE), '/slow': hang}
+        scraper = self.scraper([self.source("slow", '/slow', timeout=10), self.source("fast", '/fast')])
+
+        standings, elapsed = self.fetch(scraper)
+
+        self.assertEqual(len(standings), 20)
+        self.assertEqual(scraper.standings_source, "fast")
+        self.assertLess(elapsed, 2)
+        # The losing source's connection is shut, not left to its 10 s timeout
+        self.assertTrue(self.server.disconnected.wait(2), "slow source connection was not closed")
+        self.assertNoFetchThreads()
+
+    def test_invalid_source_falls_through_to_the_next(self):
+        self.server.routes = {'/empty': page(b"<html><table></table></html>"),
+                              '/gazeta': page(GAZETA_PAGE, delay=0.2)}
+        scraper = self.scraper([self.source("empty", '/empty'), self.source("gazeta", '/gazeta', 'gazeta')])
+
+        standings, _ = self.fetch(scraper)
+
+        self.assertEqual(len(standings), 20)
+        self.assertEqual(scraper.standings_source, "gazeta")
+
+    def test_overall_deadline(self):
+        self.server.routes = {'/a': hang, '/b': hang}
+        scraper = self.scraper([self.source("a", '/a', timeout=10), self.source("b", '/b', timeout=10)],
+                               fetch_deadline=0.5)
+
+        standings, elapsed = self.fetch(scraper)
+
+        self.assertIsNone(standings)
+        self.assertLess(elapsed, 1.5)
+        self.assertNoFetchThreads()
+
+    def test_all_sources_failing(self):
+        self.server.routes = {'/gone': status(404)}
+        scraper = self.scraper([self.source("gone", '/gone')])
+
+        standings, _ = self.fetch(scraper)
+
+        self.assertIsNone(standings)
+
+
+class Retries(SourceTestCase):
+    def client(self, **options):
+        client = HttpClient(None, backoff_base=0.01, **options)
+        self.addCleanup(client.close)
+        return client
+
+    def test_503_is_retried_on_the_same_connection(self):
+        self.server.routes = {'/page': failing(2, page(b"ok"))}
+        client = self.client()
+
+        response = client.request(self.server.base + '/page')
+
+        self.assertEqual((response.status, response.text), (200, "ok"))
+        self.assertEqual(client.stats['retries'], 2)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(client.stats['reused'], 2)
+
+    def test_retries_are_bounded(self):
+        self.server.routes = {'/down': status(503)}
+        client = self.client(max_retries=2)
+
+        response = client.request(self.server.base + '/down')
+
+        self.assertEqual(response.status, 503)
+        self.assertEqual(self.server.hits['/down'], 3)
+
+    def test_cancelled_source_stops_retrying(self):
+        self.server.routes = {'/busy': status(503), '/fast': page(ESPN_PAGE, delay=0.2)}
+        scraper = self.scraper([self.source("busy", '/busy'), self.source("fast", '/fast')])
+        scraper.http.backoff_base = 5  # a backoff sleep would outlive the fetch by seconds
+
+        standings, elapsed = self.fetch(scraper)
+
+        self.assertEqual(scraper.standings_source, "fast")
+        self.assertLess(elapsed, 2)
+        self.assertNoFetchThreads()
+        self.assertEqual(self.server.hits['/busy'], 1)
+
+
+class EarlyStopAndRevalidation(SourceTestCase):
+    def test_download_stops_once_the_table_is_complete(self):
+        self.server.routes = {'/espn': page(ESPN_PAGE)}
+        scraper = self.scraper([])
+        scraper.http.chunk_size = 4096
+
+        standings = scraper.scrape_source(self.source("espn", '/espn'))
+
+        self.assertEqual(len(standings), 20)
+        self.assertEqual(scraper.http.stats['early_stops'], 1)
+        self.assertLess(scraper.http.stats['bytes'], len(ESPN_PAGE) * 0.7)
+
+    def test_unchanged_table_is_not_parsed(self):
+        self.server.routes = {'/gazeta': page(GAZETA_PAGE)}
+        scraper = self.scraper([self.source("gazeta", '/gazeta', 'gazeta')])
+        self.fetch(scraper)
+        known = dict(scraper.fingerprints)
+        scraper.start_metrics()
+
+        standings, _ = self.fetch(scraper, known_fingerprints=known)
+
+        self.assertIs(standings, STANDINGS_UNCHANGED)
+        self.assertNotIn('parse', scraper.metrics.stages)
+
+    def test_304_serves_the_cached_page(self):
+        self.server.routes = {'/gazeta': revalidated(GAZETA_PAGE, '"v1"')}
+        scraper = self.scraper([self.source("gazeta", '/gazeta', 'gazeta')], cache=True, cache_ttl=0)
+
+        first, _ = self.fetch(scraper)
+        second, _ = self.fetch(scraper)
+
+        self.assertEqual(len(first), 20)
+        self.assertEqual(second, first)
+        self.assertEqual(scraper.http_cache.revalidated, 1)
+        self.assertEqual(self.server.hits['/gazeta'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()